@@ -127,7 +127,8 @@ export default function ResultsScreen() {
       const moreRecipes = await loadMoreRecipes(
         originalIngredients as string,
         fitnessGoal as string,
-        mealType as string
+        mealType as string,
+        allRecipes.map(recipe => recipe.name)
       );
       
       if (moreRecipes.recipes && moreRecipes.recipes.length > 0) {
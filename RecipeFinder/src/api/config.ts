@@ -125,7 +125,7 @@ export const searchRecipes = async (ingredients: string, fitnessGoal: string, me
     return await requestPromise;
 };
 
-export const loadMoreRecipes = async (ingredients: string, fitnessGoal: string, mealType: string) => {
+export const loadMoreRecipes = async (ingredients: string, fitnessGoal: string, mealType: string, excludeRecipes: string[] = []) => {
     const requestKey = createRequestKey(ingredients, fitnessGoal, mealType, true);
     
     // Check if there's already a pending request for the same parameters
@@ -154,14 +154,16 @@ export const loadMoreRecipes = async (ingredients: string, fitnessGoal: string,
                 ingredients: ingredientsList,
                 fitness_goal: fitnessGoal,
                 meal_type: mealType,
-                allow_extra_ingredients: true
+                allow_extra_ingredients: true,
+                exclude_recipes: excludeRecipes
             });
 
             const response = await api.post('/recipes/more', {
                 ingredients: ingredientsList,
                 fitness_goal: fitnessGoal,
                 meal_type: mealType,
-                allow_extra_ingredients: true
+                allow_extra_ingredients: true,
+                exclude_recipes: excludeRecipes
             });
 
             console.log('Load more response:', response.data);
@@ -1,22 +1,115 @@
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Union, Tuple, AsyncIterator
 import openai
 from dotenv import load_dotenv
 import os
+import re
+import math
+import asyncio
 import json
-from datetime import datetime, timedelta
+import time
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime
 import hashlib
 
+from cache import RecipeCache
+from coalesce import SingleFlight
+from corpus import RECIPE_CORPUS_MIN_MATCHES, RecipeCorpus
+from ingredients import IngredientIndex, canonical_set
+from llm import LLMClient
+from metrics import JSON_PARSES, STAGE_SECONDS, MetricsMiddleware, log_event, render as render_metrics, stage
+from prefetch import Prefetcher
+from ratelimit import RATE_LIMIT_SWEEP_INTERVAL, Decision, limiter_from_env
+from stream_parser import RecipeStreamParser
+
 # Load environment variables
 load_dotenv()
 
-# Check for API key
+# One JSON object per log line (see metrics.log_event)
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'), format="%(message)s")
+# The openai library logs every response at INFO; our own events cover it
+logging.getLogger("openai").setLevel(logging.WARNING)
+
+# Check for API key; the app still starts without one (e.g. offline benchmarks),
+# but generation requests will fail until it is set
 if not os.getenv('OPENAI_API_KEY'):
-    raise ValueError("No OpenAI API key found. Please set the OPENAI_API_KEY environment variable.")
+    log_event("openai_key_missing", level=logging.WARNING,
+              detail="No OpenAI API key found. Please set the OPENAI_API_KEY environment variable.")
+
+# Shared async OpenAI client (pooled connection + concurrency limit)
+llm_client = LLMClient()
+
+# Per-client sliding-window limits on the recipe generation endpoints
+rate_limiter = limiter_from_env()
+RATE_LIMITED_PATHS = {"/recipes", "/recipes/stream", "/recipes/more"}
+
+def client_ip(request: Request) -> str:
+    return getattr(request.client, 'host', 'unknown')
+
+async def check_rate_limit(ip: str, count: bool = True) -> Decision:
+    """Count a request against the client's limits (or just report them)"""
+    call = rate_limiter.hit if count else rate_limiter.peek
+    if rate_limiter.blocking:
+        return await asyncio.to_thread(call, ip)
+    return call(ip)
+
+async def rate_limit_stats() -> Dict[str, Any]:
+    # The SQLite limiter's stats take its lock and run a COUNT(*)
+    if rate_limiter.blocking:
+        return await asyncio.to_thread(rate_limiter.stats)
+    return rate_limiter.stats()
+
+async def sweep_rate_limits():
+    # Forget clients that have been idle long enough for their windows to empty
+    while True:
+        await asyncio.sleep(RATE_LIMIT_SWEEP_INTERVAL)
+        if rate_limiter.blocking:
+            await asyncio.to_thread(rate_limiter.evict_idle)
+        else:
+            rate_limiter.evict_idle()
+
+async def rate_limit_middleware(request: Request, call_next):
+    if request.method != "POST" or request.url.path not in RATE_LIMITED_PATHS:
+        return await call_next(request)
 
-app = FastAPI(title="Recipe Finder API")
+    decision = await check_rate_limit(client_ip(request))
+    headers = {
+        "X-RateLimit-Remaining-Hourly": str(decision.hourly_remaining),
+        "X-RateLimit-Remaining-Daily": str(decision.daily_remaining),
+    }
+    if not decision.allowed:
+        headers["Retry-After"] = str(math.ceil(decision.retry_after))
+        return JSONResponse(status_code=429, content={"detail": "Rate limit exceeded"}, headers=headers)
+
+    response = await call_next(request)
+    response.headers.update(headers)
+    return response
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await llm_client.start()
+    warmed = await asyncio.to_thread(recipe_cache.warm_start)
+    log_event("cache_warmed", entries=warmed)
+    loaded = await asyncio.to_thread(recipe_corpus.load)
+    log_event("corpus_loaded", recipes=loaded)
+    sweeper = asyncio.create_task(sweep_rate_limits())
+    yield
+    sweeper.cancel()
+    prefetcher.close()
+    rate_limiter.close()
+    await llm_client.close()
+    recipe_cache.close()
+    recipe_corpus.close()
+
+app = FastAPI(title="Recipe Finder API", lifespan=lifespan)
+
+# Rate limiting sits inside CORS so 429 responses still carry CORS headers
+app.add_middleware(BaseHTTPMiddleware, dispatch=rate_limit_middleware)
 
 # Add CORS middleware
 app.add_middleware(
@@ -27,13 +120,26 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+# Outermost, so request timings include rate limiting and CORS
+app.add_middleware(MetricsMiddleware, paths=RATE_LIMITED_PATHS | {"/rate-limit", "/stats", "/metrics", "/"})
+
 openai.api_key = os.getenv('OPENAI_API_KEY')
 
-# Rate limit tracking
-rate_limits: Dict[str, Dict[str, Any]] = {}
+# Near-match lookup over cached ingredient sets
+ingredient_index = IngredientIndex()
+
+# LRU/TTL cache for common ingredient combinations, shared across workers via SQLite;
+# entries loaded from the shared store are indexed for near-matches too
+recipe_cache = RecipeCache.from_env(index=ingredient_index)
+
+# Previously generated recipes, searched before calling OpenAI
+recipe_corpus = RecipeCorpus.from_env()
+
+# Identical in-flight /recipes generations share one OpenAI call
+recipe_flight = SingleFlight()
 
-# Simple cache for common ingredient combinations
-recipe_cache: Dict[str, Dict[str, Any]] = {}
+# Next "load more" page, generated in the background after each page is served
+prefetcher = Prefetcher()
 
 class Ingredient(BaseModel):
     name: str
@@ -47,49 +153,33 @@ class RecipeRequest(BaseModel):
     max_cooking_time: Optional[int] = None
     is_more: bool = False
     allow_extra_ingredients: bool = False
+    # Names of recipes the client already has, so "load more" returns new ones
+    exclude_recipes: List[str] = []
+
+def match_context(data: RecipeRequest) -> Tuple[str, str, bool]:
+    """Request fields other than ingredients that a cached answer must agree on"""
+    return (
+        (data.fitness_goal or "").strip().lower(),
+        (data.meal_type or "").strip().lower(),
+        data.allow_extra_ingredients,
+    )
 
 def create_cache_key(data: RecipeRequest) -> str:
-    """Create a cache key for the request"""
-    ingredients_str = ",".join(sorted([ing.name.lower() for ing in data.ingredients]))
-    return hashlib.md5(f"{ingredients_str}_{data.fitness_goal}_{data.meal_type}_{data.allow_extra_ingredients}".encode()).hexdigest()
-
-def check_rate_limit(ip: str) -> bool:
-    now = datetime.now()
-    if ip not in rate_limits:
-        rate_limits[ip] = {
-            'daily': {'count': 0, 'reset': now + timedelta(days=1)},
-            'hourly': {'count': 0, 'reset': now + timedelta(hours=1)}
-        }
-    
-    # Reset counters if time expired
-    if now >= rate_limits[ip]['daily']['reset']:
-        rate_limits[ip]['daily'] = {'count': 0, 'reset': now + timedelta(days=1)}
-    if now >= rate_limits[ip]['hourly']['reset']:
-        rate_limits[ip]['hourly'] = {'count': 0, 'reset': now + timedelta(hours=1)}
-    
-    # Check limits - Much more generous for production
-    if (rate_limits[ip]['daily']['count'] >= 10000 or 
-        rate_limits[ip]['hourly']['count'] >= 1000):
-        return False
-    
-    # Increment counters
-    rate_limits[ip]['daily']['count'] += 1
-    rate_limits[ip]['hourly']['count'] += 1
-    return True
+    """Create a cache key for the request from its canonical ingredient set"""
+    ingredients_str = ",".join(sorted(canonical_set(ing.name for ing in data.ingredients)))
+    goal, meal, extra = match_context(data)
+    return hashlib.md5(f"{ingredients_str}_{goal}_{meal}_{extra}".encode()).hexdigest()
 
-def generate_recipes(data: RecipeRequest) -> Dict[str, Any]:
-    try:
-        # Check cache first
-        cache_key = create_cache_key(data)
-        if cache_key in recipe_cache and not data.is_more:
-            print(f"Cache hit for key: {cache_key}")
-            return recipe_cache[cache_key]
+SYSTEM_PROMPT = "You are a chef. You must return ONLY valid JSON with exactly 3 recipes. Do not include any text before or after the JSON."
 
-        # Format ingredients for prompt
-        ingredients_text = ", ".join([ing.name for ing in data.ingredients])
+def build_prompt(data: RecipeRequest) -> str:
+    """Build the user prompt for a recipe request"""
+    # Format ingredients for prompt
+    ingredients_text = ", ".join([ing.name for ing in data.ingredients])
+    avoid_text = f" Do not repeat these recipes: {', '.join(data.exclude_recipes)}." if data.exclude_recipes else ""
 
-        # Simplified prompt for faster response
-        prompt = f"""Create 3 healthy recipes for {data.fitness_goal or 'general fitness'} {data.meal_type or 'meal'} using: {ingredients_text}.
+    # Simplified prompt for faster response
+    return f"""Create 3 healthy recipes for {data.fitness_goal or 'general fitness'} {data.meal_type or 'meal'} using: {ingredients_text}.{avoid_text}
 
 Each recipe should include:
 - Name, description, ingredients, instructions
@@ -111,99 +201,330 @@ Return as JSON array with structure:
     "prep_time": number
 }}"""
 
-        # Use GPT-3.5-turbo for faster response
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",  # Faster than GPT-4
-            messages=[
-                {"role": "system", "content": "You are a chef. You must return ONLY valid JSON with exactly 3 recipes. Do not include any text before or after the JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=1500  # Limit response size for speed
-        )
+def build_messages(data: RecipeRequest) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": build_prompt(data)}
+    ]
 
-        content = response.choices[0].message.content.strip()
-        
-        # Try to extract JSON if there's extra text
+def parse_recipes(content: str) -> List[Dict[str, Any]]:
+    """Parse the recipe array out of a completion, tolerating extra text"""
+    with stage("json_parse"):
         try:
             # First try direct parsing
             recipes = json.loads(content)
+            JSON_PARSES.inc("direct")
+            return recipes
         except json.JSONDecodeError:
             # Try to find JSON in the response
-            import re
             json_match = re.search(r'\[.*\]', content, re.DOTALL)
             if json_match:
                 try:
                     recipes = json.loads(json_match.group())
+                    JSON_PARSES.inc("regex_fallback")
+                    return recipes
                 except json.JSONDecodeError:
-                    raise HTTPException(status_code=500, detail="Failed to parse recipe data from OpenAI response")
-            else:
-                raise HTTPException(status_code=500, detail="No valid JSON found in OpenAI response")
-        
-        result = {"recipes": recipes, "has_extra_ingredients": data.allow_extra_ingredients}
-        
-        # Cache the result (only for non-load-more requests)
-        if not data.is_more:
-            recipe_cache[cache_key] = result
-            # Keep cache size manageable
-            if len(recipe_cache) > 100:
-                # Remove oldest entries
-                oldest_keys = list(recipe_cache.keys())[:20]
-                for key in oldest_keys:
-                    del recipe_cache[key]
-        
-        return result
+                    pass
+            JSON_PARSES.inc("failed")
+            log_event("json_parse_failed", level=logging.WARNING, length=len(content))
+            if json_match:
+                raise HTTPException(status_code=500, detail="Failed to parse recipe data from OpenAI response")
+            raise HTTPException(status_code=500, detail="No valid JSON found in OpenAI response")
+
+async def lookup_cached(data: RecipeRequest, cache_key: str) -> Optional[Dict[str, Any]]:
+    """Return a cached result for the request, exact or near-match"""
+    if data.is_more:
+        return None
+
+    ingredients = canonical_set(ing.name for ing in data.ingredients)
+    context = match_context(data)
+    cached = await recipe_cache.aget(cache_key)
+    if cached is not None:
+        log_event("cache_hit", key=cache_key)
+        ingredient_index.add(cache_key, ingredients, context)
+        return cached
+
+    # Fall back to the closest cached ingredient set
+    match = ingredient_index.find(ingredients, context, allow_superset=data.allow_extra_ingredients)
+    if match is not None:
+        match_key, similarity = match
+        cached = await recipe_cache.aget(match_key, record=False)
+        if cached is not None:
+            log_event("near_match_hit", key=cache_key, match=match_key, similarity=round(similarity, 3))
+            ingredient_index.hits += 1
+            return cached
+        ingredient_index.discard(match_key)
+    return None
+
+def lookup_corpus(data: RecipeRequest) -> Optional[Dict[str, Any]]:
+    """Answer from stored recipes if enough of them fit the request"""
+    recipes = recipe_corpus.search(
+        canonical_set(ing.name for ing in data.ingredients),
+        fitness_goal=data.fitness_goal,
+        meal_type=data.meal_type,
+        max_minutes=data.max_cooking_time,
+        allow_extra=data.allow_extra_ingredients,
+        exclude=data.exclude_recipes,
+        limit=RECIPE_CORPUS_MIN_MATCHES
+    )
+    if len(recipes) < RECIPE_CORPUS_MIN_MATCHES:
+        recipe_corpus.misses += 1
+        return None
+    recipe_corpus.hits += 1
+    return {"recipes": recipes, "has_extra_ingredients": data.allow_extra_ingredients}
+
+async def store_result(data: RecipeRequest, cache_key: str, result: Dict[str, Any]) -> None:
+    # Every generated recipe, including "load more" pages, feeds the corpus
+    new_rows = recipe_corpus.add(result["recipes"], data.fitness_goal, data.meal_type)
+    if new_rows and recipe_corpus.store is not None:
+        await asyncio.to_thread(recipe_corpus.store.add_many, new_rows)
+
+    # Cache the result (only for non-load-more requests)
+    if not data.is_more:
+        ingredients = canonical_set(ing.name for ing in data.ingredients)
+        context = match_context(data)
+        await recipe_cache.aset(cache_key, result, ingredients, context)
+        ingredient_index.add(cache_key, ingredients, context)
 
+async def _generate_uncached(data: RecipeRequest, cache_key: str) -> Dict[str, Any]:
+    # Use GPT-3.5-turbo for faster response
+    with stage("prompt_build"):
+        messages = build_messages(data)
+    response = await llm_client.chat(
+        model="gpt-3.5-turbo",  # Faster than GPT-4
+        messages=messages,
+        temperature=0.7,
+        max_tokens=1500  # Limit response size for speed
+    )
+
+    content = response.choices[0].message.content.strip()
+    recipes = parse_recipes(content)
+    
+    result = {"recipes": recipes, "has_extra_ingredients": data.allow_extra_ingredients}
+    await store_result(data, cache_key, result)
+    return result
+
+async def generate_recipes(data: RecipeRequest) -> Dict[str, Any]:
+    try:
+        # Check cache first
+        cache_key = create_cache_key(data)
+        if data.is_more:
+            # Page through stored recipes before generating new ones
+            with stage("corpus_lookup"):
+                stored = lookup_corpus(data)
+            if stored is not None:
+                log_event("corpus_hit", key=cache_key, is_more=True)
+                return stored
+            return await _generate_uncached(data, cache_key)
+
+        with stage("cache_lookup"):
+            cached = await lookup_cached(data, cache_key)
+        if cached is not None:
+            return cached
+
+        with stage("corpus_lookup"):
+            stored = lookup_corpus(data)
+        if stored is not None:
+            log_event("corpus_hit", key=cache_key, is_more=False)
+            await store_result(data, cache_key, stored)
+            return stored
+
+        # Join an identical pending generation instead of starting another
+        snapshot = data.model_copy(deep=True)
+        return await recipe_flight.do(cache_key, lambda: _generate_uncached(snapshot, cache_key))
+
+    except HTTPException:
+        raise
     except json.JSONDecodeError as e:
         raise HTTPException(status_code=500, detail="Failed to parse recipe data")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def more_request(data: RecipeRequest, recipes: List[Dict[str, Any]]) -> RecipeRequest:
+    """The "load more" request the client will send after seeing these recipes"""
+    shown = list(data.exclude_recipes) + [
+        str(recipe["name"]) for recipe in recipes if isinstance(recipe, dict) and recipe.get("name")
+    ]
+    return data.model_copy(
+        update={"is_more": True, "allow_extra_ingredients": True, "exclude_recipes": shown},
+        deep=True
+    )
+
+def page_key(data: RecipeRequest) -> str:
+    """Prefetch key shared by a query's first page and all of its "load more" pages"""
+    return create_cache_key(data.model_copy(update={"allow_extra_ingredients": True}))
+
+def schedule_prefetch(data: RecipeRequest, result: Dict[str, Any]) -> None:
+    # Speculatively generate the next page while the user reads this one
+    next_page = more_request(data, result["recipes"])
+    key = page_key(data)
+    if prefetcher.schedule(key, lambda: generate_recipes(next_page)):
+        log_event("prefetch_scheduled", key=key, excluded=len(next_page.exclude_recipes))
+
+def format_event(event: str, payload: Any, sse: bool) -> str:
+    """Encode one stream event as a Server-Sent Event or an NDJSON line"""
+    if sse:
+        return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+    return json.dumps({"event": event, "data": payload}) + "\n"
+
+async def stream_recipes(data: RecipeRequest, sse: bool) -> AsyncIterator[str]:
+    """Yield each recipe as soon as the model finishes writing it"""
+    try:
+        cache_key = create_cache_key(data)
+        with stage("cache_lookup"):
+            cached = await lookup_cached(data, cache_key)
+        if cached is not None:
+            for recipe in cached["recipes"]:
+                yield format_event("recipe", recipe, sse)
+            schedule_prefetch(data, cached)
+            yield format_event("done", {"has_extra_ingredients": cached["has_extra_ingredients"], "cached": True}, sse)
+            return
+
+        with stage("corpus_lookup"):
+            stored = lookup_corpus(data)
+        if stored is not None:
+            await store_result(data, cache_key, stored)
+            for recipe in stored["recipes"]:
+                yield format_event("recipe", recipe, sse)
+            schedule_prefetch(data, stored)
+            yield format_event("done", {"has_extra_ingredients": data.allow_extra_ingredients, "cached": True}, sse)
+            return
+
+        with stage("prompt_build"):
+            messages = build_messages(data)
+        parser = RecipeStreamParser()
+        recipes = []
+        parse_seconds = 0.0
+        async for delta in llm_client.chat_stream(
+            model="gpt-3.5-turbo",
+            messages=messages,
+            temperature=0.7,
+            max_tokens=1500
+        ):
+            started = time.perf_counter()
+            parsed = parser.feed(delta)
+            parse_seconds += time.perf_counter() - started
+            for recipe in parsed:
+                recipes.append(recipe)
+                yield format_event("recipe", recipe, sse)
+        STAGE_SECONDS.observe(parse_seconds, "json_parse")
+
+        if recipes and not parser.complete:
+            # Cut off or broken mid-array: the recipes sent so far are a partial
+            # page, so report an error rather than caching it as a result
+            JSON_PARSES.inc("truncated")
+            log_event("json_parse_failed", level=logging.WARNING, length=len(parser.text), streamed=len(recipes))
+            raise HTTPException(status_code=500, detail="Failed to parse recipe data from OpenAI response")
+        if recipes:
+            JSON_PARSES.inc("incremental")
+        else:
+            # Nothing object-shaped came through; fall back to parsing the whole body
+            recipes = parse_recipes(parser.text.strip())
+            for recipe in recipes:
+                yield format_event("recipe", recipe, sse)
+
+        result = {"recipes": recipes, "has_extra_ingredients": data.allow_extra_ingredients}
+        await store_result(data, cache_key, result)
+        schedule_prefetch(data, result)
+        yield format_event("done", {"has_extra_ingredients": data.allow_extra_ingredients, "cached": False}, sse)
+
+    except HTTPException as e:
+        yield format_event("error", {"detail": e.detail}, sse)
+    except Exception as e:
+        yield format_event("error", {"detail": str(e)}, sse)
+
+def json_response(result: Dict[str, Any]) -> JSONResponse:
+    with stage("serialization"):
+        return JSONResponse(result)
+
 @app.post("/recipes")
 async def create_recipes(request: Request, data: RecipeRequest):
     try:
         # First try with exact ingredients
-        result = generate_recipes(data)
-        return result
+        result = await generate_recipes(data)
+        schedule_prefetch(data, result)
+        return json_response(result)
     except Exception as e:
         if "ingredients" in str(e).lower() and not data.allow_extra_ingredients:
             # Try again allowing extra ingredients
             data.allow_extra_ingredients = True
             try:
-                result = generate_recipes(data)
-                return result
+                result = await generate_recipes(data)
+                schedule_prefetch(data, result)
+                return json_response(result)
             except Exception as e2:
                 raise HTTPException(status_code=500, detail=str(e2))
         raise
 
+@app.post("/recipes/stream")
+async def create_recipes_stream(request: Request, data: RecipeRequest):
+    # Server-Sent Events if the client asks for them, NDJSON otherwise
+    sse = "text/event-stream" in request.headers.get("accept", "")
+    return StreamingResponse(
+        stream_recipes(data, sse),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/recipes/more")
 async def get_more_recipes(request: Request, data: RecipeRequest):
     try:
         # For load more, always allow extra ingredients and request different recipes
         data.allow_extra_ingredients = True
         data.is_more = True
-        result = generate_recipes(data)
-        return result
+        # Use the page prefetched after the previous response, if any
+        key = page_key(data)
+        with stage("prefetch_wait"):
+            result = await prefetcher.take(key, exclude=data.exclude_recipes)
+        if result is not None:
+            log_event("prefetch_hit", key=key)
+        else:
+            result = await generate_recipes(data)
+        schedule_prefetch(data, result)
+        return json_response(result)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/rate-limit")
 async def get_rate_limit(request: Request):
-    client_ip = getattr(request.client, 'host', 'unknown')
-    if client_ip in rate_limits:
-        return {
-            "daily_remaining": max(0, 50 - rate_limits[client_ip]['daily']['count']),
-            "hourly_remaining": max(0, 5 - rate_limits[client_ip]['hourly']['count']),
-            "daily_reset": rate_limits[client_ip]['daily']['reset'].isoformat(),
-            "hourly_reset": rate_limits[client_ip]['hourly']['reset'].isoformat()
-        }
+    decision = await check_rate_limit(client_ip(request), count=False)
+    return {
+        "daily_remaining": decision.daily_remaining,
+        "hourly_remaining": decision.hourly_remaining,
+        "daily_reset": datetime.fromtimestamp(decision.daily_reset).isoformat(),
+        "hourly_reset": datetime.fromtimestamp(decision.hourly_reset).isoformat()
+    }
+
+@app.get("/stats")
+async def get_stats():
     return {
-        "daily_remaining": 50,
-        "hourly_remaining": 5,
-        "daily_reset": (datetime.now() + timedelta(days=1)).isoformat(),
-        "hourly_reset": (datetime.now() + timedelta(hours=1)).isoformat()
+        "cache": recipe_cache.stats(),
+        "near_match": ingredient_index.stats(),
+        "corpus": recipe_corpus.stats(),
+        "rate_limit": await rate_limit_stats(),
+        "coalescing": recipe_flight.stats(),
+        "prefetch": prefetcher.stats()
     }
 
+@app.get("/metrics")
+async def get_metrics():
+    body = render_metrics({
+        "recipe_cache": recipe_cache.stats(),
+        "recipe_near_match": ingredient_index.stats(),
+        "recipe_corpus": recipe_corpus.stats(),
+        "recipe_coalescing": recipe_flight.stats(),
+        "recipe_prefetch": prefetcher.stats(),
+        "recipe_rate_limit": await rate_limit_stats(),
+        "recipe_openai": {
+            "in_flight": llm_client.in_flight,
+            "waiting": llm_client.waiting,
+            "max_concurrency": llm_client.max_concurrency
+        }
+    })
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
 @app.get("/")
 async def root():
     return {"message": "Recipe Finder API is running"}
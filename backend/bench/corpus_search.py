@@ -0,0 +1,51 @@
+"""Time RecipeCorpus.search over a synthetic corpus.
+
+    cd backend && python -m bench.corpus_search --recipes 20000
+    cd backend && python -m bench.corpus_search --recipes 20000 --vocab 8000
+"""
+import argparse
+import random
+import string
+import time
+
+from bench.workload import BASE_SETS, EXTRAS, GOALS
+from corpus import RecipeCorpus
+
+MEALS = ["breakfast", "lunch", "dinner", "snack"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Corpus search latency")
+    parser.add_argument("--recipes", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--vocab", type=int, default=300, help="distinct filler ingredients")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = sorted({name for base in BASE_SETS for name in base} | set(EXTRAS))
+    # Quantities are stripped from recipe lines, so filler ingredients are letters only
+    vocabulary += ["".join(rng.choices(string.ascii_lowercase, k=7)) for _ in range(args.vocab)]
+    corpus = RecipeCorpus(max_recipes=args.recipes)
+
+    start = time.perf_counter()
+    for i in range(args.recipes):
+        ingredients = rng.sample(vocabulary, rng.randint(3, 8))
+        recipe = {"name": f"Recipe {i}", "ingredients": ingredients,
+                  "cooking_time": rng.randint(5, 60), "prep_time": rng.randint(5, 20)}
+        corpus.add([recipe], rng.choice(GOALS), rng.choice(MEALS))
+    build = time.perf_counter() - start
+
+    queries = [set(rng.choice(BASE_SETS)) | {rng.choice(EXTRAS)} for _ in range(args.queries)]
+    start = time.perf_counter()
+    found = 0
+    for query in queries:
+        found += len(corpus.search(query, fitness_goal="weight loss", max_minutes=45, allow_extra=True))
+    elapsed = time.perf_counter() - start
+
+    print(f"corpus: {len(corpus)} recipes, {corpus.stats()['ingredients']} ingredients (built in {build:.2f}s)")
+    print(f"search: {elapsed / args.queries * 1000:.3f} ms/query, {found / args.queries:.2f} results/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Local stand-in for the OpenAI chat completions endpoint.
+
+Run it standalone with::
+
+    python -m bench.fake_openai --port 8100 --latency 1.0 --token-rate 50 --error-rate 0.05
+
+and point the backend at it with ``OPENAI_API_BASE=http://127.0.0.1:8100/v1``.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from typing import Any, Dict, List
+
+from aiohttp import web
+
+
+def fake_recipes(seed: str, count: int = 3, start: int = 0) -> List[Dict[str, Any]]:
+    return [
+        {
+            "name": f"{seed.title()} Skillet {i + 1}",
+            "description": f"A simple {seed} dish",
+            "ingredients": [seed, "olive oil", "salt"],
+            "instructions": ["Prep the ingredients", "Cook until done"],
+            "nutrition": {"calories": 400 + i, "protein": 30, "carbs": 35, "fats": 12},
+            "goal_alignment": "Balanced macros",
+            "cooking_time": 20,
+            "prep_time": 10,
+        }
+        for i in range(start, start + count)
+    ]
+
+
+class FakeOpenAI:
+    """aiohttp app that answers chat completions after a fixed delay.
+
+    ``latency`` is the time to the first token; streamed responses then send
+    the content in ``chunk_size`` pieces every ``chunk_delay`` seconds (or at
+    ``token_rate`` tokens per second, counting four characters per token),
+    and non-streamed ones wait for the same total before answering.
+    ``malformed_rate`` of completions are cut off mid-JSON and
+    ``error_rate`` of calls fail with a 500, both drawn from a seeded RNG.
+    """
+
+    def __init__(self, latency: float = 1.0, chunk_delay: float = 0.0, chunk_size: int = 16,
+                 token_rate: float = 0.0, malformed_rate: float = 0.0, error_rate: float = 0.0,
+                 seed: int = 0):
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.chunk_size = chunk_size
+        self.token_rate = token_rate
+        self.malformed_rate = malformed_rate
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.errors = 0
+        self.malformed = 0
+
+    def _delay_per_chunk(self) -> float:
+        if self.token_rate > 0:
+            return self.chunk_size / 4 / self.token_rate
+        return self.chunk_delay
+
+    def _chunks(self, content: str) -> List[str]:
+        return [content[i:i + self.chunk_size] for i in range(0, len(content), self.chunk_size)]
+
+    async def chat_completions(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        self.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            prompt = body["messages"][-1]["content"]
+            seed = prompt.split("using:")[-1].split(".")[0].strip() or "mixed"
+            # Honour "Do not repeat these recipes" by numbering past them
+            start = max((int(n) for n in re.findall(r"Skillet (\d+)", prompt)), default=0)
+            content = json.dumps(fake_recipes(seed, start=start))
+            model = body.get("model", "gpt-3.5-turbo")
+            await asyncio.sleep(self.latency)
+            if self.rng.random() < self.error_rate:
+                self.errors += 1
+                return web.json_response(
+                    {"error": {"message": "The server had an error", "type": "server_error"}},
+                    status=500,
+                )
+            if self.rng.random() < self.malformed_rate:
+                self.malformed += 1
+                content = content[:len(content) * 2 // 3]
+            if body.get("stream"):
+                return await self._stream(request, content, model)
+            await asyncio.sleep(self._delay_per_chunk() * len(self._chunks(content)))
+        finally:
+            self.in_flight -= 1
+        return web.json_response({
+            "id": f"chatcmpl-{self.calls}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 200, "completion_tokens": 400, "total_tokens": 600},
+        })
+
+    async def _stream(self, request: web.Request, content: str, model: str) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        chunks = self._chunks(content)
+        for i, piece in enumerate(chunks):
+            event = {
+                "id": f"chatcmpl-{self.calls}",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "delta": {"content": piece},
+                    "finish_reason": "stop" if i == len(chunks) - 1 else None,
+                }],
+            }
+            await response.write(f"data: {json.dumps(event)}\n\n".encode())
+            delay = self._delay_per_chunk()
+            if delay:
+                await asyncio.sleep(delay)
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.chat_completions)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8100) -> web.AppRunner:
+        runner = web.AppRunner(self.make_app())
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return runner
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=1.0, help="seconds to first token")
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="seconds between streamed chunks")
+    parser.add_argument("--token-rate", type=float, default=0.0,
+                        help="completion tokens per second (overrides --chunk-delay)")
+    parser.add_argument("--malformed-rate", type=float, default=0.0,
+                        help="share of completions truncated mid-JSON")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of calls answered with a 500")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    upstream = FakeOpenAI(args.latency, chunk_delay=args.chunk_delay, token_rate=args.token_rate,
+                          malformed_rate=args.malformed_rate, error_rate=args.error_rate, seed=args.seed)
+    web.run_app(upstream.make_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""Offline end-to-end benchmark of the request path.
+
+Boots the fake OpenAI server in-process and the API under uvicorn, then
+replays a workload of user sessions from ``--concurrency`` parallel clients:
+each session posts /recipes for a Zipf-distributed ingredient set and some
+follow up with "load more" taps that overlap with other sessions' traffic.
+Reports p50/p95/p99 latency per endpoint, throughput, cache hit rate and
+upstream call counts; ``--fail-p95`` turns it into a regression gate.
+
+    cd backend && python -m bench.harness --sessions 300 --concurrency 32 --latency 0.5
+    cd backend && python -m bench.harness --save-workload workload.jsonl
+    cd backend && python -m bench.harness --workload workload.jsonl --error-rate 0.05 --json
+    cd backend && python -m bench.harness --env PREFETCH_MAX_CONCURRENCY=0
+"""
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+import aiohttp
+
+from bench import workload
+from bench.fake_openai import FakeOpenAI
+from bench.load_test import start_backend, wait_until_up
+
+# (endpoint, status, seconds); status 0 means the connection itself failed
+Sample = Tuple[str, int, float]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+async def post(session: aiohttp.ClientSession, url: str, body: Dict[str, Any],
+               samples: List[Sample], endpoint: str) -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        async with session.post(url, json=body) as resp:
+            payload = await resp.json(content_type=None)
+            status = resp.status
+    except (aiohttp.ClientError, ValueError):
+        payload, status = {}, 0
+    samples.append((endpoint, status, time.perf_counter() - start))
+    return payload if status == 200 else {}
+
+
+async def run_session(session: aiohttp.ClientSession, base_url: str, item: Dict[str, Any],
+                      samples: List[Sample]) -> None:
+    body = item["body"]
+    page = await post(session, f"{base_url}/recipes", body, samples, "/recipes")
+    shown = [recipe.get("name") for recipe in page.get("recipes", [])]
+    for _ in range(item.get("more", 0) if page else 0):
+        await asyncio.sleep(item.get("think", 0))
+        page = await post(session, f"{base_url}/recipes/more",
+                          {**body, "exclude_recipes": shown}, samples, "/recipes/more")
+        if not page:
+            break
+        shown += [recipe.get("name") for recipe in page.get("recipes", [])]
+
+
+async def replay(base_url: str, items: List[Dict[str, Any]], concurrency: int) -> Tuple[List[Sample], float]:
+    queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+    for item in items:
+        queue.put_nowait(item)
+    samples: List[Sample] = []
+
+    async def worker(session: aiohttp.ClientSession) -> None:
+        while not queue.empty():
+            await run_session(session, base_url, queue.get_nowait(), samples)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*[worker(session) for _ in range(concurrency)])
+        wall = time.perf_counter() - start
+    return samples, wall
+
+
+def latency_summary(samples: List[Sample]) -> Dict[str, Any]:
+    latencies = sorted(seconds for _, status, seconds in samples if status == 200)
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for _, status, _ in samples if status != 200),
+        "p50": round(percentile(latencies, 50), 4),
+        "p95": round(percentile(latencies, 95), 4),
+        "p99": round(percentile(latencies, 99), 4),
+    }
+
+
+def build_report(samples: List[Sample], wall: float, upstream: FakeOpenAI,
+                 stats: Dict[str, Any]) -> Dict[str, Any]:
+    cache = stats["cache"]
+    lookups = cache["hits"] + cache["misses"]
+    local_hits = cache["hits"] + stats["near_match"]["hits"]
+    return {
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(samples) / wall, 2) if wall else 0.0,
+        "latency": {
+            "all": latency_summary(samples),
+            **{endpoint: latency_summary([s for s in samples if s[0] == endpoint])
+               for endpoint in ("/recipes", "/recipes/more")},
+        },
+        "cache_hit_rate": round(local_hits / lookups, 4) if lookups else 0.0,
+        "upstream": {
+            "calls": upstream.calls,
+            "calls_per_request": round(upstream.calls / len(samples), 4) if samples else 0.0,
+            "peak_in_flight": upstream.peak_in_flight,
+            "injected_errors": upstream.errors,
+            "malformed": upstream.malformed,
+        },
+        "backend": {
+            "cache": cache,
+            "near_match_hits": stats["near_match"]["hits"],
+            "corpus": stats["corpus"],
+            "coalescing": stats["coalescing"],
+            "prefetch": stats["prefetch"],
+        },
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"wall time:        {report['wall_seconds']:.2f}s")
+    print(f"throughput:       {report['throughput_rps']:.1f} req/s")
+    for endpoint, summary in report["latency"].items():
+        print(f"{endpoint:16s}  n={summary['requests']:<5d} errors={summary['errors']:<4d}"
+              f" p50 {summary['p50'] * 1000:8.1f}ms  p95 {summary['p95'] * 1000:8.1f}ms"
+              f"  p99 {summary['p99'] * 1000:8.1f}ms")
+    upstream = report["upstream"]
+    print(f"cache hit rate:   {report['cache_hit_rate']:.1%} (exact + near match)")
+    print(f"upstream calls:   {upstream['calls']} ({upstream['calls_per_request']:.2f} per request,"
+          f" peak overlap {upstream['peak_in_flight']}, injected errors {upstream['injected_errors']},"
+          f" malformed {upstream['malformed']})")
+    backend = report["backend"]
+    print(f"corpus hits:      {backend['corpus']['hits']}")
+    print(f"coalesced:        {backend['coalescing']['coalesced']}")
+    prefetch = backend["prefetch"]
+    print(f"prefetch hits:    {prefetch['ready_hits'] + prefetch['pending_hits']}"
+          f" of {prefetch['scheduled']} scheduled")
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    if args.workload:
+        items = workload.load(args.workload)
+    else:
+        items = workload.sessions(args.sessions, seed=args.seed, zipf_s=args.zipf,
+                                  more_ratio=args.more_ratio, max_more=args.max_more,
+                                  think=args.think)
+    if args.save_workload:
+        workload.save(args.save_workload, items)
+
+    upstream = FakeOpenAI(latency=args.latency, token_rate=args.token_rate,
+                          malformed_rate=args.malformed_rate, error_rate=args.error_rate,
+                          seed=args.seed)
+    runner = await upstream.start(port=args.upstream_port)
+    env = {
+        # One client address sends everything, so lift the per-client limits
+        "RATE_LIMIT_HOURLY": "1000000000",
+        "RATE_LIMIT_DAILY": "1000000000",
+        "LOG_LEVEL": "ERROR",
+    }
+    env.update(dict(pair.split("=", 1) for pair in args.env))
+    backend = start_backend(args.port, args.upstream_port, env)
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        async with aiohttp.ClientSession() as session:
+            await wait_until_up(session, base_url)
+        samples, wall = await replay(base_url, items, args.concurrency)
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"{base_url}/stats") as resp:
+                stats = await resp.json()
+    finally:
+        backend.terminate()
+        backend.wait()
+        await runner.cleanup()
+    return build_report(samples, wall, upstream, stats)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline benchmark of the recipe request path")
+    workload_args = parser.add_argument_group("workload")
+    workload_args.add_argument("--sessions", type=int, default=300)
+    workload_args.add_argument("--concurrency", type=int, default=32, help="parallel clients")
+    workload_args.add_argument("--seed", type=int, default=7)
+    workload_args.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent for ingredient sets")
+    workload_args.add_argument("--more-ratio", type=float, default=0.3,
+                               help="share of sessions that tap load more")
+    workload_args.add_argument("--max-more", type=int, default=2, help="load more taps per session")
+    workload_args.add_argument("--think", type=float, default=0.5,
+                               help="max seconds before each load more tap")
+    workload_args.add_argument("--workload", help="replay sessions from a JSONL file")
+    workload_args.add_argument("--save-workload", help="write the sessions to a JSONL file")
+
+    upstream_args = parser.add_argument_group("fake OpenAI")
+    upstream_args.add_argument("--latency", type=float, default=0.5, help="seconds to first token")
+    upstream_args.add_argument("--token-rate", type=float, default=0.0, help="completion tokens per second")
+    upstream_args.add_argument("--malformed-rate", type=float, default=0.0)
+    upstream_args.add_argument("--error-rate", type=float, default=0.0)
+
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="extra backend environment, e.g. PREFETCH_MAX_CONCURRENCY=0")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--upstream-port", type=int, default=8100)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--fail-p95", type=float, help="exit non-zero if overall p95 exceeds this many seconds")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    if args.fail_p95 is not None and report["latency"]["all"]["p95"] > args.fail_p95:
+        print(f"FAIL: p95 {report['latency']['all']['p95']:.3f}s exceeds {args.fail_p95:.3f}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
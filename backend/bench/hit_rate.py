@@ -0,0 +1,89 @@
+"""Replay a /recipes request log and compare cache hit rates across key strategies.
+
+Each line of the log is a JSON /recipes request body. Without ``--log`` a
+synthetic log is generated: popular ingredient sets drawn from a Zipf
+distribution, written with the plural/synonym/descriptor variations and
+one-ingredient additions or omissions real users produce.
+
+    cd backend && python -m bench.hit_rate --requests 5000
+    cd backend && python -m bench.hit_rate --log requests.jsonl --threshold 0.7
+"""
+import argparse
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-local-bench")
+os.environ["RECIPE_CACHE_DB"] = ""
+
+from app import RecipeRequest, create_cache_key, match_context  # noqa: E402
+from bench.workload import synthetic_log  # noqa: E402
+from ingredients import IngredientIndex, canonical_set  # noqa: E402
+
+def legacy_cache_key(data: RecipeRequest) -> str:
+    """The original exact, lower-cased key, kept for comparison"""
+    ingredients_str = ",".join(sorted([ing.name.lower() for ing in data.ingredients]))
+    return hashlib.md5(f"{ingredients_str}_{data.fitness_goal}_{data.meal_type}_{data.allow_extra_ingredients}".encode()).hexdigest()
+
+
+def replay(log: List[RecipeRequest], strategy: str, capacity: int, threshold: float) -> Dict[str, Any]:
+    cache: "OrderedDict[str, bool]" = OrderedDict()
+    index = IngredientIndex(threshold=threshold, max_entries=capacity)
+    hits = near_hits = 0
+    for data in log:
+        key = legacy_cache_key(data) if strategy == "legacy" else create_cache_key(data)
+        if key in cache:
+            cache.move_to_end(key)
+            hits += 1
+            continue
+        ingredients = canonical_set(ing.name for ing in data.ingredients)
+        context = match_context(data)
+        if strategy == "near":
+            match = index.find(ingredients, context, allow_superset=data.allow_extra_ingredients)
+            if match is not None and match[0] in cache:
+                cache.move_to_end(match[0])
+                near_hits += 1
+                continue
+        cache[key] = True
+        index.add(key, ingredients, context)
+        if len(cache) > capacity:
+            evicted, _ = cache.popitem(last=False)
+            index.discard(evicted)
+    total = len(log)
+    return {
+        "strategy": strategy,
+        "hit_rate": (hits + near_hits) / total if total else 0.0,
+        "exact_hits": hits,
+        "near_hits": near_hits,
+        "upstream_calls": total - hits - near_hits,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay a request log against cache key strategies")
+    parser.add_argument("--log", help="JSONL file of /recipes request bodies")
+    parser.add_argument("--requests", type=int, default=5000, help="synthetic log size")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--capacity", type=int, default=1000)
+    parser.add_argument("--threshold", type=float, default=0.75)
+    args = parser.parse_args()
+
+    if args.log:
+        with open(args.log) as f:
+            bodies = [json.loads(line) for line in f if line.strip()]
+    else:
+        bodies = synthetic_log(args.requests, seed=args.seed)
+    log = [RecipeRequest(**body) for body in bodies]
+
+    print(f"requests: {len(log)}  capacity: {args.capacity}  threshold: {args.threshold}")
+    for strategy in ("legacy", "canonical", "near"):
+        result = replay(log, strategy, args.capacity, args.threshold)
+        print(f"{result['strategy']:>10}: hit rate {result['hit_rate']:6.1%}  "
+              f"(exact {result['exact_hits']}, near {result['near_hits']}, "
+              f"upstream calls {result['upstream_calls']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Concurrency load test for the /recipes endpoint against the fake OpenAI stub.
+
+Boots the fake upstream in-process and the API under uvicorn in a subprocess,
+then fires concurrent /recipes requests with distinct ingredient sets. With a
+non-blocking pipeline the upstream sees overlapping calls and the wall time
+stays close to a single upstream latency instead of ``requests * latency``.
+With ``--identical`` every request shares one ingredient set and should be
+served by a single coalesced upstream call.
+
+    cd backend && python -m bench.load_test --requests 20 --latency 1.0
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from typing import List
+
+import aiohttp
+
+from bench.fake_openai import FakeOpenAI
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_backend(port: int, upstream_port: int, extra_env=None) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "OPENAI_API_KEY": "sk-local-bench",
+        "OPENAI_API_BASE": f"http://127.0.0.1:{upstream_port}/v1",
+        # Start every run cold; a persisted cache would hide upstream calls
+        "RECIPE_CACHE_DB": "",
+    })
+    env.update(extra_env or {})
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+
+
+async def wait_until_up(session: aiohttp.ClientSession, base_url: str, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            async with session.get(f"{base_url}/") as resp:
+                if resp.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError(f"Backend at {base_url} did not come up")
+
+
+async def post_recipes(session: aiohttp.ClientSession, base_url: str, ingredients: List[str]) -> float:
+    payload = {"ingredients": [{"name": name} for name in ingredients]}
+    start = time.perf_counter()
+    async with session.post(f"{base_url}/recipes", json=payload) as resp:
+        await resp.read()
+        resp.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def run(args: argparse.Namespace) -> None:
+    upstream = FakeOpenAI(latency=args.latency)
+    runner = await upstream.start(port=args.upstream_port)
+    # Prefetched "load more" pages would add upstream calls this test counts
+    backend = start_backend(args.port, args.upstream_port, {"PREFETCH_MAX_CONCURRENCY": "0"})
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        async with aiohttp.ClientSession() as session:
+            await wait_until_up(session, base_url)
+            start = time.perf_counter()
+            latencies = await asyncio.gather(*[
+                post_recipes(session, base_url, ["chicken" if args.identical else f"ingredient{i}", "rice"])
+                for i in range(args.requests)
+            ])
+            wall = time.perf_counter() - start
+            async with session.get(f"{base_url}/stats") as resp:
+                stats = await resp.json()
+    finally:
+        backend.terminate()
+        backend.wait()
+        await runner.cleanup()
+
+    print(f"requests:            {args.requests}")
+    print(f"upstream latency:    {args.latency:.2f}s")
+    print(f"wall time:           {wall:.2f}s (serial would be ~{args.requests * args.latency:.2f}s)")
+    print(f"slowest request:     {max(latencies):.2f}s")
+    print(f"upstream calls:      {upstream.calls}")
+    print(f"peak upstream overlap: {upstream.peak_in_flight}")
+    print(f"coalescing:          {stats['coalescing']}")
+    if args.identical:
+        if upstream.calls != 1:
+            print("FAIL: identical requests were not coalesced")
+            sys.exit(1)
+    elif upstream.peak_in_flight <= 1 and args.requests > 1:
+        print("FAIL: upstream calls never overlapped")
+        sys.exit(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent /recipes load test")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--identical", action="store_true",
+                        help="send the same ingredient set to exercise request coalescing")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--upstream-port", type=int, default=8100)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Latency of "load more" with and without speculative prefetching.
+
+Each simulated user posts /recipes, reads the page for ``--think`` seconds
+and then taps "load more" with the names it already has. The run is done
+twice against the fake OpenAI stub, once with prefetching disabled
+(PREFETCH_MAX_CONCURRENCY=0) and once with the defaults, and fails if a
+"load more" page repeats a recipe the user was already shown.
+
+    cd backend && python -m bench.prefetch_test --users 4 --latency 1.0
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import aiohttp
+
+from bench.fake_openai import FakeOpenAI
+from bench.load_test import start_backend, wait_until_up
+
+
+async def browse(session: aiohttp.ClientSession, base_url: str, user: int,
+                 think: float, pages: int) -> Tuple[List[float], bool]:
+    payload = {"ingredients": [{"name": f"ingredient{user}"}, {"name": "rice"}],
+               "allow_extra_ingredients": True}
+    async with session.post(f"{base_url}/recipes", json=payload) as resp:
+        resp.raise_for_status()
+        shown = [recipe["name"] for recipe in (await resp.json())["recipes"]]
+
+    latencies = []
+    repeated = False
+    for _ in range(pages):
+        await asyncio.sleep(think)
+        start = time.perf_counter()
+        async with session.post(f"{base_url}/recipes/more",
+                                json={**payload, "exclude_recipes": shown}) as resp:
+            resp.raise_for_status()
+            names = [recipe["name"] for recipe in (await resp.json())["recipes"]]
+        latencies.append(time.perf_counter() - start)
+        repeated |= bool(set(names) & set(shown))
+        shown += names
+    return latencies, repeated
+
+
+async def measure(args: argparse.Namespace, env: Dict[str, str]) -> Tuple[List[float], bool, Dict]:
+    upstream = FakeOpenAI(latency=args.latency)
+    runner = await upstream.start(port=args.upstream_port)
+    backend = start_backend(args.port, args.upstream_port, env)
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        async with aiohttp.ClientSession() as session:
+            await wait_until_up(session, base_url)
+            results = await asyncio.gather(*[
+                browse(session, base_url, user, args.think, args.pages) for user in range(args.users)
+            ])
+            async with session.get(f"{base_url}/stats") as resp:
+                stats = (await resp.json())["prefetch"]
+    finally:
+        backend.terminate()
+        backend.wait()
+        await runner.cleanup()
+    latencies = [latency for user_latencies, _ in results for latency in user_latencies]
+    return latencies, any(repeated for _, repeated in results), stats
+
+
+async def run(args: argparse.Namespace) -> None:
+    failed = False
+    for label, env in (("no prefetch", {"PREFETCH_MAX_CONCURRENCY": "0"}), ("prefetch", {})):
+        latencies, repeated, stats = await measure(args, env)
+        print(f"{label:12s} load more: median {statistics.median(latencies):.3f}s,"
+              f" max {max(latencies):.3f}s  prefetch stats: {stats}")
+        if repeated:
+            print(f"FAIL: {label} returned a recipe the user had already seen")
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load more latency with prefetching")
+    parser.add_argument("--users", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=2, help="load more taps per user")
+    parser.add_argument("--think", type=float, default=1.5, help="seconds spent reading each page")
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--upstream-port", type=int, default=8100)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Per-request cost of the rate limiter as the number of distinct clients grows.
+
+    cd backend && python -m bench.rate_limit --clients 100000
+    cd backend && python -m bench.rate_limit --clients 10000 --sqlite
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from ratelimit import DAY, SlidingWindowLimiter, SQLiteLimiter
+
+
+def ip(i: int) -> str:
+    return f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rate limiter microbenchmark")
+    parser.add_argument("--clients", type=int, default=100000)
+    parser.add_argument("--sample", type=int, default=10000, help="hits timed at each checkpoint")
+    parser.add_argument("--sqlite", action="store_true", help="benchmark the shared SQLite backend")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        limiter = SQLiteLimiter(os.path.join(tempfile.mkdtemp(), "rate_limits.db"))
+    else:
+        limiter = SlidingWindowLimiter(max_clients=args.clients * 2)
+    rng = random.Random(1)
+    now = time.time()
+
+    print(f"{'clients':>10} {'new client':>12} {'repeat hit':>12}")
+    checkpoints = sorted({args.clients // 100, args.clients // 10, args.clients})
+    added = 0
+    for checkpoint in checkpoints:
+        start = time.perf_counter()
+        for i in range(added, checkpoint):
+            limiter.hit(ip(i), now)
+        new_cost = (time.perf_counter() - start) / max(1, checkpoint - added)
+        added = checkpoint
+
+        sample = [ip(rng.randrange(added)) for _ in range(args.sample)]
+        start = time.perf_counter()
+        for client in sample:
+            limiter.hit(client, now)
+        repeat_cost = (time.perf_counter() - start) / len(sample)
+        print(f"{checkpoint:>10} {new_cost * 1e6:>10.2f}us {repeat_cost * 1e6:>10.2f}us")
+
+    start = time.perf_counter()
+    evicted = limiter.evict_idle(now + 3 * DAY)
+    print(f"evict_idle: {evicted} clients in {time.perf_counter() - start:.3f}s")
+
+    if not args.sqlite:
+        # Measured separately; tracing allocations slows every hit down
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        limiter = SlidingWindowLimiter(max_clients=args.clients * 2)
+        for i in range(args.clients):
+            limiter.hit(ip(i), now)
+        used = tracemalloc.get_traced_memory()[0] - base
+        tracemalloc.stop()
+        print(f"memory: {used / 1e6:.1f} MB for {len(limiter)} clients ({used / len(limiter):.0f} B/client)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Compare time-to-first-recipe for /recipes and /recipes/stream.
+
+Runs against the fake OpenAI stub with a slow token rate so the gap between
+the first and last recipe is visible.
+
+    cd backend && python -m bench.stream_test --latency 0.3 --chunk-delay 0.02
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+import aiohttp
+
+from bench.fake_openai import FakeOpenAI
+from bench.load_test import start_backend, wait_until_up
+
+
+async def time_buffered(session: aiohttp.ClientSession, base_url: str, payload: dict) -> float:
+    start = time.perf_counter()
+    async with session.post(f"{base_url}/recipes", json=payload) as resp:
+        resp.raise_for_status()
+        await resp.read()
+    return time.perf_counter() - start
+
+
+async def time_streamed(session: aiohttp.ClientSession, base_url: str, payload: dict):
+    start = time.perf_counter()
+    first = None
+    recipes = 0
+    async with session.post(f"{base_url}/recipes/stream", json=payload) as resp:
+        resp.raise_for_status()
+        async for line in resp.content:
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            if event["event"] == "recipe":
+                recipes += 1
+                if first is None:
+                    first = time.perf_counter() - start
+            elif event["event"] == "error":
+                raise RuntimeError(event["data"]["detail"])
+    return first, time.perf_counter() - start, recipes
+
+
+async def run(args: argparse.Namespace) -> None:
+    upstream = FakeOpenAI(latency=args.latency, chunk_delay=args.chunk_delay)
+    runner = await upstream.start(port=args.upstream_port)
+    # Prefetched "load more" pages would add upstream calls this test counts
+    backend = start_backend(args.port, args.upstream_port, {"PREFETCH_MAX_CONCURRENCY": "0"})
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        async with aiohttp.ClientSession() as session:
+            await wait_until_up(session, base_url)
+            buffered = await time_buffered(session, base_url, {"ingredients": [{"name": "tofu"}]})
+            first, total, recipes = await time_streamed(session, base_url, {"ingredients": [{"name": "lentils"}]})
+            cached_first, _, _ = await time_streamed(session, base_url, {"ingredients": [{"name": "lentil"}]})
+    finally:
+        backend.terminate()
+        backend.wait()
+        await runner.cleanup()
+
+    print(f"/recipes first recipe:         {buffered:.2f}s")
+    print(f"/recipes/stream first recipe:  {first:.2f}s (all {recipes} by {total:.2f}s)")
+    print(f"/recipes/stream cached replay: {cached_first:.3f}s")
+    if upstream.calls != 2:
+        print("FAIL: streamed result was not cached")
+        sys.exit(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Streaming time-to-first-recipe check")
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--chunk-delay", type=float, default=0.02)
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--upstream-port", type=int, default=8100)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Synthetic /recipes traffic shared by the benchmarks.
+
+Popular ingredient sets are drawn from a Zipf distribution and written with
+the plural/synonym/descriptor variations and one-ingredient additions or
+omissions real users produce. Everything is driven by a seeded RNG, so a
+given seed always replays the same workload.
+"""
+import json
+import random
+from typing import Any, Dict, List
+
+BASE_SETS = [
+    ["chicken", "rice", "broccoli"],
+    ["egg", "spinach", "tomato"],
+    ["salmon", "sweet potato", "asparagus"],
+    ["beef", "pepper", "onion"],
+    ["oat", "banana", "yogurt"],
+    ["chickpea", "tomato", "onion", "garlic"],
+    ["tofu", "rice", "green onion"],
+    ["turkey", "pasta", "zucchini"],
+    ["shrimp", "garlic", "pasta"],
+    ["pork", "apple", "potato"],
+    ["lentil", "carrot", "onion"],
+    ["tuna", "avocado", "rice"],
+]
+
+VARIANTS = {
+    "chicken": ["chicken", "Chicken breast", "chicken breasts", "boneless skinless chicken thighs"],
+    "rice": ["rice", "brown rice", "Jasmine rice", "white rice"],
+    "broccoli": ["broccoli", "Broccoli"],
+    "egg": ["egg", "eggs", "Eggs", "egg whites"],
+    "spinach": ["spinach", "fresh spinach", "baby spinach"],
+    "tomato": ["tomato", "tomatoes", "Cherry tomatoes", "diced tomatoes"],
+    "salmon": ["salmon", "salmon fillets", "Salmon"],
+    "sweet potato": ["sweet potato", "sweet potatoes", "Sweet Potatoes"],
+    "asparagus": ["asparagus", "Asparagus"],
+    "beef": ["beef", "ground beef", "steak", "lean beef"],
+    "pepper": ["pepper", "bell peppers", "red bell pepper", "capsicum"],
+    "onion": ["onion", "onions", "red onion", "yellow onions"],
+    "oat": ["oats", "rolled oats", "oatmeal"],
+    "banana": ["banana", "bananas"],
+    "yogurt": ["yogurt", "greek yogurt", "Greek yoghurt"],
+    "chickpea": ["chickpeas", "garbanzo beans", "canned chickpeas"],
+    "garlic": ["garlic", "garlic cloves", "minced garlic"],
+    "tofu": ["tofu", "firm tofu"],
+    "green onion": ["green onions", "scallions", "spring onion"],
+    "turkey": ["turkey", "ground turkey", "turkey breast"],
+    "pasta": ["pasta", "spaghetti", "penne"],
+    "zucchini": ["zucchini", "courgettes"],
+    "shrimp": ["shrimp", "prawns"],
+    "pork": ["pork", "pork chops", "pork loin"],
+    "apple": ["apple", "apples"],
+    "potato": ["potato", "potatoes"],
+    "lentil": ["lentils", "red lentils"],
+    "carrot": ["carrot", "carrots"],
+    "tuna": ["tuna", "canned tuna", "tuna steak"],
+    "avocado": ["avocado", "avocados"],
+}
+
+EXTRAS = ["garlic", "onion", "lemon", "olive oil", "spinach", "cheese", "carrot"]
+GOALS = ["weight loss", "muscle gain", None]
+
+
+def synthetic_log(count: int, seed: int = 7, zipf_s: float = 1.1) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) ** zipf_s for rank in range(len(BASE_SETS) * len(GOALS))]
+    log = []
+    for _ in range(count):
+        choice = rng.choices(range(len(weights)), weights)[0]
+        base = list(BASE_SETS[choice % len(BASE_SETS)])
+        goal = GOALS[choice // len(BASE_SETS)]
+        roll = rng.random()
+        if roll < 0.2:
+            base.append(rng.choice(EXTRAS))
+        elif roll < 0.3 and len(base) > 2:
+            base.pop(rng.randrange(len(base)))
+        names = [rng.choice(VARIANTS.get(name, [name])) for name in base]
+        rng.shuffle(names)
+        log.append({"ingredients": [{"name": name} for name in names], "fitness_goal": goal})
+    return log
+
+
+def sessions(count: int, seed: int = 7, zipf_s: float = 1.1, more_ratio: float = 0.3,
+             max_more: int = 2, think: float = 0.5) -> List[Dict[str, Any]]:
+    """User sessions: one /recipes request, sometimes followed by "load more" taps.
+
+    ``more_ratio`` of sessions tap "load more" between 1 and ``max_more``
+    times, each after up to ``think`` seconds, so load-more traffic overlaps
+    with other users' first pages.
+    """
+    rng = random.Random(seed + 1)
+    result = []
+    for body in synthetic_log(count, seed=seed, zipf_s=zipf_s):
+        body["allow_extra_ingredients"] = True
+        more = rng.randint(1, max_more) if max_more and rng.random() < more_ratio else 0
+        result.append({"body": body, "more": more, "think": round(rng.uniform(0, think), 3)})
+    return result
+
+
+def save(path: str, items: List[Dict[str, Any]]) -> None:
+    with open(path, "w") as f:
+        for item in items:
+            f.write(json.dumps(item) + "\n")
+
+
+def load(path: str) -> List[Dict[str, Any]]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -0,0 +1,238 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Hashable, List, Optional, Tuple
+
+from ingredients import IngredientIndex
+
+# Tunables for the recipe cache
+RECIPE_CACHE_MAX_ENTRIES = int(os.getenv('RECIPE_CACHE_MAX_ENTRIES', '1000'))
+RECIPE_CACHE_MAX_BYTES = int(os.getenv('RECIPE_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+RECIPE_CACHE_TTL = float(os.getenv('RECIPE_CACHE_TTL', str(7 * 24 * 3600)))
+RECIPE_CACHE_DB = os.getenv(
+    'RECIPE_CACHE_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'recipe_cache.db')
+)
+RECIPE_CACHE_DB_MAX_ROWS = int(os.getenv('RECIPE_CACHE_DB_MAX_ROWS', '50000'))
+
+
+class SQLiteBackend:
+    """On-disk cache shared by every worker on the host.
+
+    Uses WAL mode so readers in one process don't block a writer in another.
+    Rows carry their own expiry, and the table is trimmed to ``max_rows`` by
+    last access time. Each row can also carry the ingredient set and context
+    it was cached under, so other workers can rebuild their near-match index.
+    """
+
+    def __init__(self, path: str, max_rows: int = RECIPE_CACHE_DB_MAX_ROWS):
+        self.path = path
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS recipe_cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL, accessed_at REAL NOT NULL, match TEXT)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(recipe_cache)")}
+        if "match" not in columns:
+            # Tables created before the column existed; another worker may add it first
+            try:
+                self._conn.execute("ALTER TABLE recipe_cache ADD COLUMN match TEXT")
+            except sqlite3.OperationalError as e:
+                if "duplicate column" not in str(e):
+                    raise
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS recipe_cache_accessed ON recipe_cache (accessed_at)"
+        )
+
+    def get(self, key: str) -> Optional[Tuple[Any, float, Optional[Any]]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at, match FROM recipe_cache WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE recipe_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0]), row[1], json.loads(row[2]) if row[2] else None
+
+    def set(self, key: str, value: Any, expires_at: float, match: Optional[Any] = None) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO recipe_cache (key, value, expires_at, accessed_at, match)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(value), expires_at, now, json.dumps(match) if match else None),
+            )
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        self._conn.execute("DELETE FROM recipe_cache WHERE expires_at <= ?", (now,))
+        self._conn.execute(
+            "DELETE FROM recipe_cache WHERE key NOT IN"
+            " (SELECT key FROM recipe_cache ORDER BY accessed_at DESC LIMIT ?)",
+            (self.max_rows,),
+        )
+
+    def most_recent(self, limit: int) -> List[Tuple[str, Any, float, Optional[Any]]]:
+        """Return the most recently used live entries, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value, expires_at, match FROM recipe_cache WHERE expires_at > ?"
+                " ORDER BY accessed_at DESC LIMIT ?",
+                (time.time(), limit),
+            ).fetchall()
+        return [
+            (key, json.loads(value), expires_at, json.loads(match) if match else None)
+            for key, value, expires_at, match in reversed(rows)
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RecipeCache:
+    """In-process LRU cache with TTL and a byte budget, backed by an optional shared store.
+
+    Memory lookups are synchronous; ``aget``/``aset`` fall through to the
+    backend on a local miss and run its I/O in a worker thread. Entries
+    loaded from the backend are added to ``index`` under the ingredient set
+    and context they were stored with.
+    """
+
+    def __init__(self, max_entries: int = RECIPE_CACHE_MAX_ENTRIES,
+                 max_bytes: int = RECIPE_CACHE_MAX_BYTES,
+                 ttl: float = RECIPE_CACHE_TTL,
+                 backend: Optional[SQLiteBackend] = None,
+                 index: Optional[IngredientIndex] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.backend = backend
+        self.index = index
+        # key -> (value, size in bytes, expires_at)
+        self._entries: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_env(cls, index: Optional[IngredientIndex] = None) -> "RecipeCache":
+        backend = SQLiteBackend(RECIPE_CACHE_DB) if RECIPE_CACHE_DB else None
+        return cls(backend=backend, index=index)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, size, expires_at = entry
+        if expires_at <= time.time():
+            self._remove(key)
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _index(self, key: str, match: Optional[Any]) -> None:
+        if self.index is not None and match:
+            ingredients, context = match
+            self.index.add(key, frozenset(ingredients), tuple(context))
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _store(self, key: str, value: Any, expires_at: float) -> None:
+        size = len(json.dumps(value))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, size, expires_at)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._lookup(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._store(key, value, time.time() + self.ttl)
+
+    async def aget(self, key: str, record: bool = True) -> Optional[Any]:
+        """Look up a key locally, then in the backend; ``record=False`` skips the stats"""
+        value = self._lookup(key)
+        if value is not None:
+            self.hits += record
+            return value
+        if self.backend is not None:
+            found = await asyncio.to_thread(self.backend.get, key)
+            if found is not None:
+                value, expires_at, match = found
+                self._store(key, value, expires_at)
+                self._index(key, match)
+                self.hits += record
+                self.backend_hits += record
+                return value
+        self.misses += record
+        return None
+
+    async def aset(self, key: str, value: Any, ingredients: Optional[FrozenSet[str]] = None,
+                   context: Optional[Hashable] = None) -> None:
+        """Store a value; ``ingredients``/``context`` are kept so other workers can index it"""
+        expires_at = time.time() + self.ttl
+        self._store(key, value, expires_at)
+        if self.backend is not None:
+            match = [sorted(ingredients), list(context)] if ingredients is not None else None
+            await asyncio.to_thread(self.backend.set, key, value, expires_at, match)
+
+    def warm_start(self) -> int:
+        """Load the most recently used entries from the backend into memory"""
+        if self.backend is None:
+            return 0
+        for key, value, expires_at, match in self.backend.most_recent(self.max_entries):
+            self._store(key, value, expires_at)
+            self._index(key, match)
+        return len(self._entries)
+
+    def close(self) -> None:
+        if self.backend is not None:
+            self.backend.close()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "backend_hits": self.backend_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -0,0 +1,54 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class _Call:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls that share a key.
+
+    The first caller for a key starts ``fn`` in its own task; callers that
+    arrive while it is pending await the same task and get the same result
+    or exception. A cancelled caller only stops waiting - the shared work
+    keeps running for everyone else and is cancelled once nobody waits on it.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self.originated = 0
+        self.coalesced = 0
+
+    def _forget(self, key: str, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.originated += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Last waiter gave up; drop the key first so new callers start fresh
+                self._forget(key, call)
+                call.task.cancel()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "originated": self.originated,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }
@@ -0,0 +1,308 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from cache import RECIPE_CACHE_DB
+from ingredients import canonicalize, singularize
+
+# Tunables for the local recipe corpus
+RECIPE_CORPUS_MAX_RECIPES = int(os.getenv('RECIPE_CORPUS_MAX_RECIPES', '20000'))
+RECIPE_CORPUS_MIN_MATCHES = int(os.getenv('RECIPE_CORPUS_MIN_MATCHES', '3'))
+RECIPE_CORPUS_MIN_COVERAGE = float(os.getenv('RECIPE_CORPUS_MIN_COVERAGE', '0.5'))
+RECIPE_CORPUS_MAX_MISSING = int(os.getenv('RECIPE_CORPUS_MAX_MISSING', '2'))
+
+# Assumed to be in every kitchen, so never counted as missing
+PANTRY = {
+    "salt", "black pepper", "salt and pepper", "oil", "water", "cooking spray",
+    "garlic powder", "paprika", "cumin", "chili powder", "herb", "spice",
+}
+
+# Quantity and filler words stripped from recipe ingredient lines
+UNITS = {
+    "g", "kg", "mg", "ml", "l", "cup", "tbsp", "tsp", "tablespoon", "teaspoon", "oz",
+    "ounce", "lb", "pound", "pinch", "dash", "handful", "slice", "can", "piece", "bunch",
+    "floret", "fillet", "clove", "sprig", "stalk", "leaf",
+    "to", "taste", "of", "a", "an", "for", "serving", "optional", "about", "plus",
+}
+
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+
+def _popcount(rows: np.ndarray) -> np.ndarray:
+    """Number of set bits in each row of a uint64 matrix (SWAR, no lookup table)"""
+    x = rows - ((rows >> np.uint64(1)) & _M1)
+    x = (x & _M2) + ((x >> np.uint64(2)) & _M2)
+    x = (x + (x >> np.uint64(4))) & _M4
+    return ((x * _H01) >> np.uint64(56)).sum(axis=1, dtype=np.int64)
+
+
+def recipe_ingredient_name(line: str) -> str:
+    """Canonical ingredient from a recipe line, e.g. "2 cups brown rice, cooked" -> "rice" """
+    head = re.split(r"[,(]", line, 1)[0].lower()
+    words = [word for word in re.findall(r"[a-z]+", head) if singularize(word) not in UNITS]
+    return canonicalize(" ".join(words)) if words else ""
+
+
+def _total_time(recipe: Dict[str, Any]) -> int:
+    try:
+        return int(float(recipe.get("cooking_time") or 0) + float(recipe.get("prep_time") or 0))
+    except (TypeError, ValueError):
+        return -1
+
+
+class CorpusStore:
+    """Persists corpus recipes in the shared SQLite file so they survive restarts.
+
+    Only the newest ``max_rows`` recipes are ever loaded back, so older ones
+    are pruned every few writes.
+    """
+
+    def __init__(self, path: str, max_rows: int = RECIPE_CORPUS_MAX_RECIPES):
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS recipe_corpus ("
+            " name_key TEXT PRIMARY KEY, fitness_goal TEXT NOT NULL, meal_type TEXT NOT NULL,"
+            " recipe TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS recipe_corpus_created ON recipe_corpus (created_at)")
+
+    def add_many(self, rows: List[tuple]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO recipe_corpus (name_key, fitness_goal, meal_type, recipe, created_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(key, goal, meal, json.dumps(recipe), now) for key, goal, meal, recipe in rows],
+            )
+            self._writes += 1
+            if self._writes % 50 == 0:
+                self._prune()
+
+    def _prune(self) -> None:
+        self._conn.execute(
+            "DELETE FROM recipe_corpus WHERE rowid NOT IN"
+            " (SELECT rowid FROM recipe_corpus ORDER BY created_at DESC LIMIT ?)",
+            (self.max_rows,),
+        )
+
+    def load(self, limit: int) -> List[tuple]:
+        """Return the newest ``limit`` recipes, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT fitness_goal, meal_type, recipe FROM recipe_corpus"
+                " ORDER BY created_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [(goal, meal, json.loads(recipe)) for goal, meal, recipe in reversed(rows)]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RecipeCorpus:
+    """Columnar store of previously generated recipes, searchable without the LLM.
+
+    Each recipe is a row: a bitset of canonical ingredients (uint64 words),
+    its ingredient count, fitness goal and meal type codes, and total
+    minutes. Per-ingredient postings narrow a search to rows sharing an
+    ingredient with the query, and only the bitset words the query touches
+    are scored, so cost follows the matches rather than the vocabulary.
+    When the corpus is full the oldest rows are overwritten and ingredient
+    bits no row uses any more are recycled.
+    """
+
+    def __init__(self, max_recipes: int = RECIPE_CORPUS_MAX_RECIPES,
+                 store: Optional[CorpusStore] = None):
+        self.max_recipes = max_recipes
+        self.store = store
+        self._vocab: Dict[str, int] = {}
+        self._bit_names: List[Optional[str]] = []
+        self._free_bits: List[int] = []
+        # bit -> rows whose recipe uses that ingredient
+        self._postings: List[Set[int]] = []
+        self._labels: Dict[str, int] = {"": 0}
+        self._bits = np.zeros((max_recipes, 1), dtype=np.uint64)
+        self._row_bits: List[Tuple[int, ...]] = [()] * max_recipes
+        self._counts = np.zeros(max_recipes, dtype=np.int64)
+        self._goal = np.zeros(max_recipes, dtype=np.int32)
+        self._meal = np.zeros(max_recipes, dtype=np.int32)
+        self._minutes = np.full(max_recipes, -1, dtype=np.int32)
+        self._names = np.empty(max_recipes, dtype=object)
+        self._recipes: List[Optional[Dict[str, Any]]] = [None] * max_recipes
+        self._keys: Dict[str, int] = {}
+        self._row_keys: List[Optional[str]] = [None] * max_recipes
+        self._size = 0
+        self._next = 0
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "RecipeCorpus":
+        store = CorpusStore(RECIPE_CACHE_DB) if RECIPE_CACHE_DB else None
+        return cls(store=store)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _label(self, value: Optional[str]) -> int:
+        value = (value or "").strip().lower()
+        if value not in self._labels:
+            self._labels[value] = len(self._labels)
+        return self._labels[value]
+
+    def _bit(self, ingredient: str) -> int:
+        bit = self._vocab.get(ingredient)
+        if bit is not None:
+            return bit
+        if self._free_bits:
+            bit = self._free_bits.pop()
+            self._bit_names[bit] = ingredient
+        else:
+            bit = len(self._bit_names)
+            self._bit_names.append(ingredient)
+            self._postings.append(set())
+            if bit // 64 >= self._bits.shape[1]:
+                extra = np.zeros((self.max_recipes, self._bits.shape[1]), dtype=np.uint64)
+                self._bits = np.hstack([self._bits, extra])
+        self._vocab[ingredient] = bit
+        return bit
+
+    def _release(self, row: int) -> None:
+        """Forget the recipe in a row about to be overwritten"""
+        del self._keys[self._row_keys[row]]
+        for bit in self._row_bits[row]:
+            rows = self._postings[bit]
+            rows.discard(row)
+            if not rows:
+                del self._vocab[self._bit_names[bit]]
+                self._bit_names[bit] = None
+                self._free_bits.append(bit)
+        self._bits[row] = 0
+
+    def _query_bits(self, ingredients: Iterable[str]) -> np.ndarray:
+        bits = np.zeros(self._bits.shape[1], dtype=np.uint64)
+        for ingredient in ingredients:
+            bit = self._vocab.get(ingredient)
+            if bit is not None:
+                bits[bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+        return bits
+
+    def add(self, recipes: List[Dict[str, Any]], fitness_goal: Optional[str],
+            meal_type: Optional[str]) -> List[tuple]:
+        """Add recipes, skipping ones already stored; returns the rows to persist"""
+        new_rows = []
+        goal, meal = self._label(fitness_goal), self._label(meal_type)
+        for recipe in recipes:
+            if not isinstance(recipe, dict) or not recipe.get("name"):
+                continue
+            name = str(recipe["name"]).strip().lower()
+            key = f"{name}|{(fitness_goal or '').lower()}|{(meal_type or '').lower()}"
+            if key in self._keys:
+                continue
+            row = self._next
+            if self._row_keys[row] is not None:
+                self._release(row)
+            names = {recipe_ingredient_name(str(line)) for line in recipe.get("ingredients") or []}
+            bits = tuple(self._bit(ingredient) for ingredient in names if ingredient)
+            for bit in bits:
+                self._bits[row, bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+                self._postings[bit].add(row)
+            self._row_bits[row] = bits
+            self._counts[row] = len(bits)
+            self._goal[row] = goal
+            self._meal[row] = meal
+            self._minutes[row] = _total_time(recipe)
+            self._names[row] = name
+            self._recipes[row] = recipe
+            self._keys[key] = row
+            self._row_keys[row] = key
+            self._next = (row + 1) % self.max_recipes
+            self._size = min(self._size + 1, self.max_recipes)
+            new_rows.append((key, (fitness_goal or "").lower(), (meal_type or "").lower(), recipe))
+        return new_rows
+
+    def search(self, ingredients: Set[str], fitness_goal: Optional[str] = None,
+               meal_type: Optional[str] = None, max_minutes: Optional[int] = None,
+               allow_extra: bool = False, exclude: Iterable[str] = (),
+               limit: int = 3) -> List[Dict[str, Any]]:
+        """Best stored recipes for a canonical ingredient set, highest coverage first.
+
+        Coverage is the share of the user's ingredients a recipe uses. Recipes
+        needing anything beyond those and the pantry are dropped unless
+        ``allow_extra`` is set, and even then at most RECIPE_CORPUS_MAX_MISSING.
+        """
+        if self._size == 0 or not ingredients:
+            return []
+
+        # Rows sharing no ingredient with the query have zero coverage
+        postings = [self._postings[self._vocab[name]] for name in ingredients if name in self._vocab]
+        if not postings:
+            return []
+        candidates = np.sort(np.fromiter(set().union(*postings), dtype=np.int64))
+
+        # Cheap metadata filters next, then bit scoring on what is left
+        if fitness_goal:
+            candidates = candidates[self._goal[candidates] == self._labels.get(fitness_goal.strip().lower(), -1)]
+        if meal_type:
+            candidates = candidates[self._meal[candidates] == self._labels.get(meal_type.strip().lower(), -1)]
+        if max_minutes:
+            minutes = self._minutes[candidates]
+            candidates = candidates[(minutes >= 0) & (minutes <= max_minutes)]
+        excluded = [name.strip().lower() for name in exclude]
+        if excluded and candidates.size:
+            candidates = candidates[~np.isin(self._names[candidates], excluded)]
+        if candidates.size == 0:
+            return []
+
+        # Only the words holding the user's or pantry bits matter; an
+        # ingredient is missing if the recipe uses it and it isn't available
+        user = self._query_bits(ingredients)
+        available = user | self._query_bits(PANTRY)
+        words = np.flatnonzero(available)
+        rows = self._bits[np.ix_(candidates, words)]
+        used = _popcount(rows & user[words])
+        missing = self._counts[candidates] - _popcount(rows & available[words])
+        coverage = used / len(ingredients)
+
+        keep = (coverage >= RECIPE_CORPUS_MIN_COVERAGE) & (
+            missing <= (RECIPE_CORPUS_MAX_MISSING if allow_extra else 0)
+        )
+        if not keep.any():
+            return []
+        score = coverage[keep] - 0.1 * missing[keep]
+        best = candidates[keep][np.argsort(-score, kind="stable")[:limit]]
+        return [self._recipes[row] for row in best]
+
+    def load(self) -> int:
+        """Rebuild the in-memory corpus from the persistent store"""
+        if self.store is None:
+            return 0
+        for goal, meal, recipe in self.store.load(self.max_recipes):
+            self.add([recipe], goal, meal)
+        return self._size
+
+    def close(self) -> None:
+        if self.store is not None:
+            self.store.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "recipes": self._size,
+            "ingredients": len(self._vocab),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
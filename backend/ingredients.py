@@ -0,0 +1,165 @@
+import os
+import re
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, Optional, Set, Tuple
+
+# Minimum Jaccard similarity for serving a cached near-match
+RECIPE_MATCH_THRESHOLD = float(os.getenv('RECIPE_MATCH_THRESHOLD', '0.75'))
+RECIPE_MATCH_MAX_ENTRIES = int(os.getenv('RECIPE_MATCH_MAX_ENTRIES', '5000'))
+
+# Words that describe an ingredient's preparation rather than what it is
+DESCRIPTORS = {
+    "fresh", "frozen", "dried", "raw", "cooked", "organic", "large", "small", "medium",
+    "chopped", "diced", "minced", "sliced", "shredded", "grated", "ground", "whole",
+    "boneless", "skinless", "lean", "extra", "virgin", "low", "fat", "free", "canned",
+}
+
+# Variant -> canonical name, applied after descriptors are dropped and words singularized
+SYNONYMS = {
+    "chicken breast": "chicken",
+    "chicken thigh": "chicken",
+    "chicken leg": "chicken",
+    "chicken drumstick": "chicken",
+    "beef mince": "beef",
+    "steak": "beef",
+    "turkey breast": "turkey",
+    "pork chop": "pork",
+    "pork loin": "pork",
+    "salmon fillet": "salmon",
+    "tuna steak": "tuna",
+    "prawn": "shrimp",
+    "egg white": "egg",
+    "egg yolk": "egg",
+    "scallion": "green onion",
+    "spring onion": "green onion",
+    "red onion": "onion",
+    "yellow onion": "onion",
+    "white onion": "onion",
+    "garlic clove": "garlic",
+    "bell pepper": "pepper",
+    "capsicum": "pepper",
+    "cilantro": "coriander",
+    "courgette": "zucchini",
+    "aubergine": "eggplant",
+    "garbanzo": "chickpea",
+    "garbanzo bean": "chickpea",
+    "rocket": "arugula",
+    "brown rice": "rice",
+    "white rice": "rice",
+    "basmati rice": "rice",
+    "jasmine rice": "rice",
+    "rolled oat": "oat",
+    "oatmeal": "oat",
+    "greek yogurt": "yogurt",
+    "yoghurt": "yogurt",
+    "olive oil": "oil",
+    "vegetable oil": "oil",
+    "cheddar cheese": "cheddar",
+    "parmesan cheese": "parmesan",
+    "mozzarella cheese": "mozzarella",
+    "spaghetti": "pasta",
+    "penne": "pasta",
+}
+
+# Words ending in "s" that are not plurals
+NOT_PLURAL = {
+    "asparagus", "hummus", "couscous", "molasses", "swiss", "citrus", "lemongrass",
+    "grass", "bass", "watercress", "brussels",
+}
+
+_IRREGULAR_PLURALS = {"leaves": "leaf", "loaves": "loaf", "knives": "knife", "oats": "oat"}
+
+
+def singularize(word: str) -> str:
+    if word in _IRREGULAR_PLURALS:
+        return _IRREGULAR_PLURALS[word]
+    if word in NOT_PLURAL or len(word) <= 3:
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("oes", "ches", "shes", "sses", "xes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us")):
+        return word[:-1]
+    return word
+
+
+def canonicalize(name: str) -> str:
+    """Map an ingredient name to its canonical form, e.g. "Fresh Tomatoes" -> "tomato" """
+    words = re.findall(r"[a-z0-9]+", name.lower())
+    words = [singularize(word) for word in words if word not in DESCRIPTORS]
+    canonical = " ".join(words) or name.strip().lower()
+    return SYNONYMS.get(canonical, canonical)
+
+
+def canonical_set(names: Iterable[str]) -> FrozenSet[str]:
+    return frozenset(canonicalize(name) for name in names)
+
+
+class IngredientIndex:
+    """Inverted index from canonical ingredient to cache keys for near-match lookups.
+
+    Entries are grouped by a context (fitness goal, meal type, ...) that must
+    match exactly; within a context, the cached set with the highest Jaccard
+    similarity to the query wins if it clears ``threshold``.
+    """
+
+    def __init__(self, threshold: float = RECIPE_MATCH_THRESHOLD,
+                 max_entries: int = RECIPE_MATCH_MAX_ENTRIES):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[FrozenSet[str], Hashable]]" = OrderedDict()
+        self._postings: Dict[str, Set[str]] = {}
+        # Near-matches actually served, counted by the caller
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, key: str, ingredients: FrozenSet[str], context: Hashable) -> None:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+        self._entries[key] = (ingredients, context)
+        for ingredient in ingredients:
+            self._postings.setdefault(ingredient, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self.discard(next(iter(self._entries)))
+
+    def discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for ingredient in entry[0]:
+            keys = self._postings.get(ingredient)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[ingredient]
+
+    def find(self, ingredients: FrozenSet[str], context: Hashable,
+             allow_superset: bool = False) -> Optional[Tuple[str, float]]:
+        """Return (key, similarity) of the closest cached set, or None.
+
+        Unless ``allow_superset`` is set, a cached set is only eligible if it
+        needs no ingredients beyond the ones in the query.
+        """
+        overlaps: Dict[str, int] = {}
+        for ingredient in ingredients:
+            for key in self._postings.get(ingredient, ()):
+                overlaps[key] = overlaps.get(key, 0) + 1
+
+        best: Optional[Tuple[str, float]] = None
+        for key, overlap in overlaps.items():
+            cached, cached_context = self._entries[key]
+            if cached_context != context:
+                continue
+            if not allow_superset and overlap < len(cached):
+                continue
+            similarity = overlap / (len(ingredients) + len(cached) - overlap)
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (key, similarity)
+        return best
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "threshold": self.threshold, "hits": self.hits}
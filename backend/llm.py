@@ -0,0 +1,150 @@
+import asyncio
+import os
+from typing import Any, AsyncIterator, Optional
+
+import aiohttp
+import openai
+from fastapi import HTTPException
+
+from metrics import OPENAI_CALLS, OPENAI_TOKENS, STAGE_SECONDS, log_event, stage
+
+# Tunables for the upstream OpenAI connection
+OPENAI_TIMEOUT = float(os.getenv('OPENAI_TIMEOUT', '30'))
+OPENAI_MAX_CONCURRENCY = int(os.getenv('OPENAI_MAX_CONCURRENCY', '16'))
+OPENAI_QUEUE_TIMEOUT = float(os.getenv('OPENAI_QUEUE_TIMEOUT', '30'))
+OPENAI_POOL_SIZE = int(os.getenv('OPENAI_POOL_SIZE', '32'))
+
+
+class LLMClient:
+    """Async chat completion client sharing one pooled HTTP session.
+
+    At most ``max_concurrency`` completions are in flight at once; extra
+    callers wait in the semaphore queue for up to ``queue_timeout`` seconds
+    before being turned away with a 503.
+    """
+
+    def __init__(self, max_concurrency: int = OPENAI_MAX_CONCURRENCY,
+                 timeout: float = OPENAI_TIMEOUT,
+                 queue_timeout: float = OPENAI_QUEUE_TIMEOUT,
+                 pool_size: int = OPENAI_POOL_SIZE):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self.pool_size = pool_size
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.in_flight = 0
+        self.waiting = 0
+
+    async def start(self) -> None:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _acquire(self, mode: str) -> None:
+        self.waiting += 1
+        try:
+            with stage("openai_queue"):
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            OPENAI_CALLS.inc(mode, "busy")
+            log_event("openai_busy", mode=mode, waiting=self.waiting, in_flight=self.in_flight)
+            raise HTTPException(status_code=503, detail="Recipe generator is busy, please try again")
+        finally:
+            self.waiting -= 1
+
+    def _record_usage(self, response: Any) -> None:
+        usage = getattr(response, "usage", None)
+        if usage:
+            OPENAI_TOKENS.inc("prompt", amount=usage.get("prompt_tokens", 0))
+            OPENAI_TOKENS.inc("completion", amount=usage.get("completion_tokens", 0))
+
+    async def chat(self, **kwargs: Any) -> Any:
+        """Run a chat completion, honouring the concurrency limit and timeout"""
+        await self.start()
+        await self._acquire("complete")
+        self.in_flight += 1
+        # openai reads the session from a context variable, so set it per call
+        token = openai.aiosession.set(self._session)
+        outcome = "error"
+        try:
+            with stage("openai_total"):
+                response = await asyncio.wait_for(
+                    openai.ChatCompletion.acreate(request_timeout=self.timeout, **kwargs),
+                    self.timeout,
+                )
+            outcome = "ok"
+            self._record_usage(response)
+            return response
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise HTTPException(status_code=504, detail="Timed out waiting for OpenAI")
+        finally:
+            OPENAI_CALLS.inc("complete", outcome)
+            openai.aiosession.reset(token)
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    async def chat_stream(self, **kwargs: Any) -> AsyncIterator[str]:
+        """Stream a chat completion, yielding content deltas as they arrive.
+
+        The concurrency slot is held until the stream is exhausted or closed,
+        and ``timeout`` bounds the whole stream rather than each chunk. A
+        completion stopped by ``max_tokens`` raises a 502 after its last delta.
+        """
+        await self.start()
+        await self._acquire("stream")
+        self.in_flight += 1
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + self.timeout
+        stream = None
+        chunks = 0
+        finish_reason = None
+        outcome = "error"
+        try:
+            # The session is only read when the request is opened, so the
+            # context variable doesn't need to outlive this call
+            token = openai.aiosession.set(self._session)
+            try:
+                stream = await asyncio.wait_for(
+                    openai.ChatCompletion.acreate(stream=True, request_timeout=self.timeout, **kwargs),
+                    self.timeout,
+                )
+            finally:
+                openai.aiosession.reset(token)
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(stream.__anext__(), deadline - loop.time())
+                except StopAsyncIteration:
+                    break
+                finish_reason = chunk.choices[0].get("finish_reason") or finish_reason
+                delta = chunk.choices[0].delta.get("content")
+                if delta:
+                    if chunks == 0:
+                        STAGE_SECONDS.observe(loop.time() - started, "openai_ttft")
+                    chunks += 1
+                    yield delta
+            if finish_reason == "length":
+                outcome = "truncated"
+                raise HTTPException(status_code=502, detail="OpenAI response was cut off")
+            outcome = "ok"
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise HTTPException(status_code=504, detail="Timed out waiting for OpenAI")
+        except GeneratorExit:
+            outcome = "cancelled"
+            raise
+        finally:
+            STAGE_SECONDS.observe(loop.time() - started, "openai_stream_total")
+            OPENAI_CALLS.inc("stream", outcome)
+            OPENAI_TOKENS.inc("completion_chunks", amount=chunks)
+            if stream is not None:
+                await stream.aclose()
+            self.in_flight -= 1
+            self._semaphore.release()
@@ -0,0 +1,175 @@
+import json
+import logging
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("recipe_api")
+
+# Seconds; spans from sub-millisecond cache lookups up to slow completions
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0,
+)
+
+
+def log_event(event: str, level: int = logging.INFO, **fields: Any) -> None:
+    """Emit one JSON log line: {"event": ..., **fields}"""
+    if logger.isEnabledFor(level):
+        logger.log(level, json.dumps({"event": event, **fields}, default=str))
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, labels)} {value:g}")
+        return lines
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``observe`` is a bisect and two additions"""
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (+Inf last), sum]
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                bucket_labels = _format_labels(self.labels, labels, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, labels)} {total[0]:.6f}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, labels)} {cumulative}")
+        return lines
+
+
+class Span:
+    """Context manager that records its wall time into a histogram"""
+
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: Histogram, labels: Tuple[str, ...]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+
+
+STAGE_SECONDS = Histogram(
+    "recipe_stage_seconds", "Time spent in each stage of recipe generation", ("stage",)
+)
+REQUEST_SECONDS = Histogram(
+    "recipe_http_request_seconds", "End-to-end HTTP request latency", ("path", "method", "status")
+)
+OPENAI_TOKENS = Counter(
+    "recipe_openai_tokens_total",
+    "OpenAI tokens used; streamed completions report content chunks as kind=completion_chunks",
+    ("kind",),
+)
+OPENAI_CALLS = Counter("recipe_openai_calls_total", "OpenAI calls by outcome", ("mode", "outcome"))
+JSON_PARSES = Counter("recipe_json_parse_total", "Completion parses by method", ("method",))
+
+REGISTRY = [STAGE_SECONDS, REQUEST_SECONDS, OPENAI_TOKENS, OPENAI_CALLS, JSON_PARSES]
+
+
+def stage(name: str) -> Span:
+    return Span(STAGE_SECONDS, (name,))
+
+
+# stats() fields that only ever go up; everything else is a point-in-time value
+COUNTER_FIELDS = {
+    "hits", "backend_hits", "misses", "evictions", "expirations", "originated", "coalesced",
+    "scheduled", "skipped", "ready_hits", "pending_hits", "errors",
+}
+
+
+def render_stats(prefix: str, stats: Dict[str, Any]) -> List[str]:
+    """Expose a component's stats() dict: COUNTER_FIELDS as counters, the rest as gauges"""
+    lines = []
+    for key, value in stats.items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            if key in COUNTER_FIELDS:
+                lines.append(f"# TYPE {prefix}_{key}_total counter")
+                lines.append(f"{prefix}_{key}_total {value:g}")
+            else:
+                lines.append(f"# TYPE {prefix}_{key} gauge")
+                lines.append(f"{prefix}_{key} {value:g}")
+    return lines
+
+
+def render(components: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    for prefix, stats in (components or {}).items():
+        lines.extend(render_stats(prefix, stats))
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """Plain ASGI middleware timing every HTTP request.
+
+    Only paths in ``paths`` get their own label; everything else is grouped
+    as "other" to keep the series count bounded.
+    """
+
+    def __init__(self, app: Any, paths: Iterable[str] = ()):
+        self.app = app
+        self.paths = set(paths)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = ["500"]
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = str(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            path = scope["path"] if scope["path"] in self.paths else "other"
+            REQUEST_SECONDS.observe(time.perf_counter() - start, path, scope["method"], status[0])
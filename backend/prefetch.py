@@ -0,0 +1,149 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from metrics import log_event
+
+# Tunables for speculative "load more" generation
+PREFETCH_TTL = float(os.getenv('PREFETCH_TTL', '300'))
+PREFETCH_MAX_PAGES = int(os.getenv('PREFETCH_MAX_PAGES', '500'))
+# Background generations allowed at once; 0 turns prefetching off
+PREFETCH_MAX_CONCURRENCY = int(os.getenv('PREFETCH_MAX_CONCURRENCY', '4'))
+
+
+class _Page:
+    __slots__ = ("task", "result", "expires_at")
+
+    def __init__(self, task: "asyncio.Future[Dict[str, Any]]", expires_at: float):
+        self.task = task
+        self.result: Optional[Dict[str, Any]] = None
+        self.expires_at = expires_at
+
+
+class Prefetcher:
+    """Per-query cache of the next "load more" page, generated in the background.
+
+    ``schedule`` starts a page generation unless one is already pending or
+    fresh for the key, or ``max_concurrency`` prefetches are already running
+    (excess is dropped, not queued, so prefetching never crowds out real
+    requests). ``take`` hands the page over exactly once: immediately if it
+    is ready, or by joining the pending task, which stays listed until the
+    page is handed over. Pages expire after ``ttl`` and the oldest are
+    dropped beyond ``max_pages``.
+    """
+
+    def __init__(self, ttl: float = PREFETCH_TTL, max_pages: int = PREFETCH_MAX_PAGES,
+                 max_concurrency: int = PREFETCH_MAX_CONCURRENCY):
+        self.ttl = ttl
+        self.max_pages = max_pages
+        self.max_concurrency = max_concurrency
+        self._pages: "OrderedDict[str, _Page]" = OrderedDict()
+        self._running = 0
+        self.scheduled = 0
+        self.skipped = 0
+        self.ready_hits = 0
+        self.pending_hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _drop(self, key: str) -> None:
+        page = self._pages.pop(key, None)
+        if page is not None and not page.task.done():
+            page.task.cancel()
+
+    def schedule(self, key: str, fn: Callable[[], Awaitable[Dict[str, Any]]]) -> bool:
+        if self.max_concurrency <= 0:
+            return False
+        now = time.monotonic()
+        page = self._pages.get(key)
+        if page is not None and page.expires_at > now:
+            return False
+        if self._running >= self.max_concurrency:
+            self.skipped += 1
+            return False
+
+        self._drop(key)
+        page = _Page(asyncio.ensure_future(fn()), now + self.ttl)
+        page.task.add_done_callback(lambda task: self._finished(key, page, task))
+        self._pages[key] = page
+        self._running += 1
+        self.scheduled += 1
+        while len(self._pages) > self.max_pages:
+            self._drop(next(iter(self._pages)))
+        return True
+
+    def _finished(self, key: str, page: _Page, task: "asyncio.Future[Dict[str, Any]]") -> None:
+        self._running -= 1
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self.errors += 1
+            log_event("prefetch_failed", key=key, error=str(error))
+            if self._pages.get(key) is page:
+                del self._pages[key]
+            return
+        page.result = task.result()
+        page.expires_at = time.monotonic() + self.ttl
+
+    async def take(self, key: str, exclude: Iterable[str] = ()) -> Optional[Dict[str, Any]]:
+        """Return the prefetched page for key, minus recipes the client already has"""
+        page = self._pages.get(key)
+        if page is None or page.expires_at <= time.monotonic():
+            if page is not None:
+                self._drop(key)
+            self.misses += 1
+            return None
+
+        result = page.result
+        ready = result is not None
+        if not ready:
+            # The page stays listed while we wait, so a cancelled request
+            # (client gone) leaves it for the next tap instead of wasting it
+            try:
+                result = await asyncio.shield(page.task)
+            except asyncio.CancelledError:
+                if not page.task.cancelled():
+                    raise
+                self.misses += 1
+                return None
+            except Exception:
+                self.misses += 1
+                return None
+        if self._pages.get(key) is not page:
+            # Taken by a concurrent request or dropped while we waited
+            self.misses += 1
+            return None
+        del self._pages[key]
+
+        excluded = {name.strip().lower() for name in exclude}
+        recipes = [
+            recipe for recipe in result.get("recipes", [])
+            if str(recipe.get("name", "")).strip().lower() not in excluded
+        ]
+        if not recipes:
+            self.misses += 1
+            return None
+        if ready:
+            self.ready_hits += 1
+        else:
+            self.pending_hits += 1
+        return {**result, "recipes": recipes}
+
+    def close(self) -> None:
+        for key in list(self._pages):
+            self._drop(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pages": len(self._pages),
+            "running": self._running,
+            "scheduled": self.scheduled,
+            "skipped": self.skipped,
+            "ready_hits": self.ready_hits,
+            "pending_hits": self.pending_hits,
+            "misses": self.misses,
+            "errors": self.errors,
+        }
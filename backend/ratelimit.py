@@ -0,0 +1,265 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# Tunables for per-client rate limiting
+RATE_LIMIT_HOURLY = int(os.getenv('RATE_LIMIT_HOURLY', '1000'))
+RATE_LIMIT_DAILY = int(os.getenv('RATE_LIMIT_DAILY', '10000'))
+RATE_LIMIT_MAX_CLIENTS = int(os.getenv('RATE_LIMIT_MAX_CLIENTS', '200000'))
+RATE_LIMIT_SWEEP_INTERVAL = float(os.getenv('RATE_LIMIT_SWEEP_INTERVAL', '60'))
+# "memory" keeps counters per process; "sqlite" shares them across workers
+RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'memory')
+RATE_LIMIT_DB = os.getenv(
+    'RATE_LIMIT_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rate_limits.db')
+)
+
+HOUR = 3600.0
+DAY = 24 * HOUR
+
+# Float slack on limit checks, so a request made exactly when retry_after
+# says it will fit isn't turned away by rounding in the sliding estimate
+_EPSILON = 1e-9
+
+
+class Decision(NamedTuple):
+    allowed: bool
+    hourly_remaining: int
+    daily_remaining: int
+    hourly_reset: float
+    daily_reset: float
+    retry_after: float
+
+
+class _Window(NamedTuple):
+    seconds: float
+    limit: int
+
+
+def _roll(start: float, current: float, previous: float, now: float,
+          seconds: float) -> Tuple[float, float, float]:
+    """Advance a window's (start, current, previous) counts to the window containing now"""
+    window_start = now - now % seconds
+    if start == window_start:
+        return start, current, previous
+    previous = current if start == window_start - seconds else 0.0
+    return window_start, 0.0, previous
+
+
+def _estimate(start: float, current: float, previous: float, now: float, seconds: float) -> float:
+    """Sliding-window count: the previous window weighted by how much of it still overlaps"""
+    return previous * (1 - (now - start) / seconds) + current
+
+
+def _retry_after(start: float, current: float, previous: float, now: float,
+                 window: _Window) -> float:
+    """Seconds until one more request fits in the window"""
+    if current + 1 <= window.limit and previous > 0:
+        # previous * (1 - (t - start) / seconds) + current + 1 <= limit
+        t = start + window.seconds * (1 - (window.limit - 1 - current) / previous)
+    else:
+        # Full for the rest of this window; in the next one the current count
+        # becomes the previous and decays until one more request fits:
+        # current * (1 - (t - start - seconds) / seconds) + 1 <= limit
+        t = start + window.seconds * (2 - (window.limit - 1) / max(current, 1.0))
+    return max(0.0, t - now)
+
+
+class SlidingWindowLimiter:
+    """Hourly and daily sliding-window counters per client, kept in process memory.
+
+    Each client costs one packed ``array('d')`` holding [start, current,
+    previous] per window plus its last-seen time, in an OrderedDict ordered
+    by last activity. Lookups and updates are O(1); ``evict_idle`` drops
+    clients from the cold end once their counts have decayed to zero, and
+    the table never grows past ``max_clients``.
+    Everything runs on the event loop thread, so no lock is needed.
+    """
+
+    # Whether calls do I/O and should be run off the event loop
+    blocking = False
+
+    def __init__(self, hourly: int = RATE_LIMIT_HOURLY, daily: int = RATE_LIMIT_DAILY,
+                 max_clients: int = RATE_LIMIT_MAX_CLIENTS):
+        self.windows = (_Window(HOUR, hourly), _Window(DAY, daily))
+        self.max_clients = max_clients
+        self._clients: "OrderedDict[str, array]" = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def _new_state(self) -> array:
+        return array('d', bytes(8 * (3 * len(self.windows) + 1)))
+
+    def _decide(self, state: array, now: float, count: bool) -> Decision:
+        allowed = True
+        estimates = []
+        for i, window in enumerate(self.windows):
+            start, current, previous = _roll(*state[3 * i:3 * i + 3], now, window.seconds)
+            state[3 * i] = start
+            state[3 * i + 1] = current
+            state[3 * i + 2] = previous
+            estimate = _estimate(start, current, previous, now, window.seconds)
+            estimates.append(estimate)
+            if estimate + 1 > window.limit + _EPSILON:
+                allowed = False
+        if count and allowed:
+            for i in range(len(self.windows)):
+                state[3 * i + 1] += 1
+            estimates = [estimate + 1 for estimate in estimates]
+        return self._decision(state, now, allowed, estimates)
+
+    def _decision(self, state: array, now: float, allowed: bool,
+                  estimates: List[float]) -> Decision:
+        (hour, day) = self.windows
+        retry_after = 0.0
+        if not allowed:
+            retry_after = max(
+                _retry_after(*state[3 * i:3 * i + 3], now, window)
+                for i, window in enumerate(self.windows)
+                if estimates[i] + 1 > window.limit + _EPSILON
+            )
+        return Decision(
+            allowed=allowed,
+            hourly_remaining=max(0, math.floor(hour.limit - estimates[0])),
+            daily_remaining=max(0, math.floor(day.limit - estimates[1])),
+            hourly_reset=state[0] + hour.seconds,
+            daily_reset=state[3] + day.seconds,
+            retry_after=retry_after,
+        )
+
+    def hit(self, client: str, now: Optional[float] = None) -> Decision:
+        """Count a request for the client if it is within its limits"""
+        now = time.time() if now is None else now
+        state = self._clients.get(client)
+        if state is None:
+            state = self._clients[client] = self._new_state()
+            if len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._clients.move_to_end(client)
+        state[-1] = now
+        return self._decide(state, now, count=True)
+
+    def peek(self, client: str, now: Optional[float] = None) -> Decision:
+        """Report a client's status without counting a request"""
+        now = time.time() if now is None else now
+        state = self._clients.get(client)
+        state = self._new_state() if state is None else array('d', state)
+        return self._decide(state, now, count=False)
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Drop clients whose every window has fully decayed"""
+        now = time.time() if now is None else now
+        idle_after = 2 * max(window.seconds for window in self.windows)
+        evicted = 0
+        while self._clients:
+            client, state = next(iter(self._clients.items()))
+            if now - state[-1] < idle_after:
+                break
+            del self._clients[client]
+            evicted += 1
+        self.evictions += evicted
+        return evicted
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "clients": len(self._clients),
+            "evictions": self.evictions,
+            "hourly_limit": self.windows[0].limit,
+            "daily_limit": self.windows[1].limit,
+        }
+
+
+class SQLiteLimiter(SlidingWindowLimiter):
+    """The same sliding windows kept in a SQLite file so limits hold across workers.
+
+    Each hit is a single ``BEGIN IMMEDIATE`` transaction, which serializes
+    concurrent updates to a client's row across processes. Calls block, so
+    the middleware runs them in a worker thread.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str = RATE_LIMIT_DB, hourly: int = RATE_LIMIT_HOURLY,
+                 daily: int = RATE_LIMIT_DAILY):
+        super().__init__(hourly, daily)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            " client TEXT PRIMARY KEY,"
+            " hour_start REAL, hour_current REAL, hour_previous REAL,"
+            " day_start REAL, day_current REAL, day_previous REAL,"
+            " last_seen REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS rate_limits_seen ON rate_limits (last_seen)")
+
+    def _load(self, client: str) -> array:
+        row = self._conn.execute(
+            "SELECT hour_start, hour_current, hour_previous, day_start, day_current, day_previous, last_seen"
+            " FROM rate_limits WHERE client = ?",
+            (client,),
+        ).fetchone()
+        return array('d', row) if row else self._new_state()
+
+    def hit(self, client: str, now: Optional[float] = None) -> Decision:
+        now = time.time() if now is None else now
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                state = self._load(client)
+                state[-1] = now
+                decision = self._decide(state, now, count=True)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO rate_limits VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (client, *state),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return decision
+
+    def peek(self, client: str, now: Optional[float] = None) -> Decision:
+        now = time.time() if now is None else now
+        with self._lock:
+            state = self._load(client)
+        return self._decide(state, now, count=False)
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        idle_after = 2 * max(window.seconds for window in self.windows)
+        with self._lock:
+            evicted = self._conn.execute(
+                "DELETE FROM rate_limits WHERE last_seen < ?", (now - idle_after,)
+            ).rowcount
+        self.evictions += evicted
+        return evicted
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            clients = self._conn.execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+        return {**super().stats(), "backend": "sqlite", "clients": clients}
+
+
+def limiter_from_env() -> SlidingWindowLimiter:
+    if RATE_LIMIT_BACKEND == "sqlite":
+        return SQLiteLimiter()
+    return SlidingWindowLimiter()
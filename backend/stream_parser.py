@@ -0,0 +1,80 @@
+import json
+from typing import Any, Dict, List
+
+
+class RecipeStreamParser:
+    """Incrementally pull complete JSON objects out of a streamed recipe array.
+
+    Text is fed in arbitrary chunks. Anything before the array's opening
+    ``[`` (prose, even with braces in it, or a ``{"recipes":`` wrapper) is
+    skipped; inside the array every ``{...}`` element is returned as soon as
+    its closing brace arrives, and the matching ``]`` ends the array. A
+    bracket pair that closes without any objects (``[3 total]``) is treated
+    as prose. Only the unparsed tail of the buffer is kept.
+
+    ``complete`` is set once the array closes and every element parsed, so a
+    completion cut off mid-array or containing a broken object can be told
+    apart from a finished one.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._start = -1
+        self._in_string = False
+        self._escape = False
+        self._in_array = False
+        self._closed = False
+        self._parsed = 0
+        self._broken = False
+        self.complete = False
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        self.text += chunk
+        self._buffer += chunk
+        objects = []
+        buffer = self._buffer
+        for i in range(self._pos, len(buffer)):
+            char = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif not self._in_array:
+                if char == "[" and not self._closed:
+                    self._in_array = True
+            elif char == '"':
+                if self._depth > 0:
+                    self._in_string = True
+            elif char == "{":
+                if self._depth == 0:
+                    self._start = i
+                self._depth += 1
+            elif char == "}" and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        objects.append(json.loads(buffer[self._start:i + 1]))
+                        self._parsed += 1
+                    except json.JSONDecodeError:
+                        self._broken = True
+                    self._start = -1
+            elif char == "]" and self._depth == 0:
+                self._in_array = False
+                if self._parsed or self._broken:
+                    # The recipe array is over; ignore anything after it
+                    self._closed = True
+                    self.complete = not self._broken
+
+        # Drop everything before the object currently being read
+        keep_from = self._start if self._depth > 0 else len(buffer)
+        self._buffer = buffer[keep_from:]
+        self._pos = len(self._buffer)
+        if self._depth > 0:
+            self._start = 0
+        return objects
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The backend modules are imported flat (``from stream_parser import ...``),
+# so make them importable however pytest is invoked
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
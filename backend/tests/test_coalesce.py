@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from coalesce import SingleFlight
+
+
+class Work:
+    """Coroutine factory that blocks until released and records what happened"""
+
+    def __init__(self, result="recipes"):
+        self.result = result
+        self.calls = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_concurrent_callers_share_one_call():
+    async def scenario():
+        flight = SingleFlight()
+        work = Work()
+        waiters = [asyncio.ensure_future(flight.do("key", work)) for _ in range(3)]
+        await settle()
+        work.release.set()
+        assert await asyncio.gather(*waiters) == ["recipes"] * 3
+        assert work.calls == 1
+        assert flight.stats() == {"originated": 1, "coalesced": 2, "in_flight": 0}
+
+    asyncio.run(scenario())
+
+
+def test_exception_reaches_every_waiter():
+    async def scenario():
+        flight = SingleFlight()
+        work = Work(result=ValueError("upstream failed"))
+        waiters = [asyncio.ensure_future(flight.do("key", work)) for _ in range(2)]
+        await settle()
+        work.release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        assert work.calls == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_leaves_shared_work_running():
+    async def scenario():
+        flight = SingleFlight()
+        work = Work()
+        first = asyncio.ensure_future(flight.do("key", work))
+        second = asyncio.ensure_future(flight.do("key", work))
+        await settle()
+        first.cancel()
+        await settle()
+        assert not work.cancelled
+        work.release.set()
+        assert await second == "recipes"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    asyncio.run(scenario())
+
+
+def test_last_waiter_leaving_cancels_work_and_forgets_key():
+    async def scenario():
+        flight = SingleFlight()
+        abandoned = Work()
+        waiters = [asyncio.ensure_future(flight.do("key", abandoned)) for _ in range(2)]
+        await settle()
+        for waiter in waiters:
+            waiter.cancel()
+        await settle()
+        assert abandoned.cancelled
+        assert flight.stats()["in_flight"] == 0
+
+        # A new caller starts fresh instead of joining the cancelled task
+        fresh = Work(result="fresh")
+        fresh.release.set()
+        assert await flight.do("key", fresh) == "fresh"
+        assert fresh.calls == 1
+
+    asyncio.run(scenario())
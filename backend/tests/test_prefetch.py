@@ -0,0 +1,78 @@
+import asyncio
+
+from prefetch import Prefetcher
+
+PAGE = {"recipes": [{"name": "Rice Bowl"}, {"name": "Tofu Stir Fry"}], "has_extra_ingredients": True}
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def blocked_page(release, calls):
+    async def generate():
+        calls.append(1)
+        await release.wait()
+        return PAGE
+    return generate
+
+
+def test_ready_page_is_handed_over_once():
+    async def scenario():
+        prefetcher = Prefetcher(ttl=60, max_pages=10, max_concurrency=2)
+        release, calls = asyncio.Event(), []
+        release.set()
+        assert prefetcher.schedule("key", blocked_page(release, calls))
+        await settle()
+        assert await prefetcher.take("key") == PAGE
+        assert await prefetcher.take("key") is None
+        assert prefetcher.stats()["ready_hits"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_excluded_recipes_are_filtered_out():
+    async def scenario():
+        prefetcher = Prefetcher(ttl=60, max_pages=10, max_concurrency=2)
+        release, calls = asyncio.Event(), []
+        release.set()
+        prefetcher.schedule("key", blocked_page(release, calls))
+        await settle()
+        page = await prefetcher.take("key", exclude=["rice bowl "])
+        assert [recipe["name"] for recipe in page["recipes"]] == ["Tofu Stir Fry"]
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_wait_keeps_the_pending_page():
+    async def scenario():
+        prefetcher = Prefetcher(ttl=60, max_pages=10, max_concurrency=2)
+        release, calls = asyncio.Event(), []
+        prefetcher.schedule("key", blocked_page(release, calls))
+
+        waiter = asyncio.ensure_future(prefetcher.take("key"))
+        await settle()
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert prefetcher.stats()["pages"] == 1
+
+        release.set()
+        assert await prefetcher.take("key") == PAGE
+        assert len(calls) == 1
+
+    asyncio.run(scenario())
+
+
+def test_failed_prefetch_is_a_miss():
+    async def scenario():
+        prefetcher = Prefetcher(ttl=60, max_pages=10, max_concurrency=2)
+
+        async def fail():
+            raise RuntimeError("upstream failed")
+
+        prefetcher.schedule("key", fail)
+        assert await prefetcher.take("key") is None
+        assert prefetcher.stats()["pages"] == 0
+
+    asyncio.run(scenario())
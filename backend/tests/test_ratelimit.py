@@ -0,0 +1,72 @@
+import pytest
+
+from ratelimit import DAY, HOUR, SlidingWindowLimiter
+
+# An hour boundary that is also a day boundary
+START = 1000 * DAY
+
+
+def fill(limiter, client, count, now):
+    for _ in range(count):
+        assert limiter.hit(client, now=now).allowed
+
+
+def assert_retry_at_boundary(limiter, client, denied, now):
+    """Still denied just before ``retry_after`` elapses, allowed exactly when it does"""
+    assert not denied.allowed
+    retry_at = now + denied.retry_after
+    assert not limiter.peek(client, now=retry_at - 1).allowed
+    assert limiter.hit(client, now=retry_at).allowed
+
+
+@pytest.mark.parametrize("limit", [1, 3, 10, 100])
+def test_limit_reached_in_current_window_retries_inside_the_next(limit):
+    limiter = SlidingWindowLimiter(hourly=limit, daily=1000 * limit)
+    fill(limiter, "a", limit, START + 100)
+    denied = limiter.hit("a", now=START + 100)
+    assert denied.hourly_remaining == 0
+    # The whole window's count still weighs on the start of the next one
+    assert denied.retry_after > HOUR - 100
+    assert_retry_at_boundary(limiter, "a", denied, START + 100)
+
+
+@pytest.mark.parametrize("limit,used", [(10, 10), (10, 7), (100, 100), (100, 55)])
+def test_retry_after_is_the_exact_boundary_in_the_next_window(limit, used):
+    limiter = SlidingWindowLimiter(hourly=limit, daily=10 * limit)
+    fill(limiter, "a", used, START + 10)
+    fill(limiter, "a", limit - used, START + HOUR)
+
+    denied = limiter.hit("a", now=START + HOUR)
+    assert_retry_at_boundary(limiter, "a", denied, START + HOUR)
+
+
+def test_previous_window_older_than_one_window_is_forgotten():
+    limiter = SlidingWindowLimiter(hourly=10, daily=1000)
+    fill(limiter, "a", 10, START + 10)
+    decision = limiter.peek("a", now=START + 2 * HOUR + 1)
+    assert decision.allowed
+    assert decision.hourly_remaining == 10
+
+
+def test_daily_limit_sets_retry_after_when_it_is_the_binding_one():
+    limiter = SlidingWindowLimiter(hourly=100, daily=5)
+    fill(limiter, "a", 5, START + 10)
+    denied = limiter.hit("a", now=START + 10)
+    assert denied.hourly_remaining == 95
+    assert denied.retry_after > DAY - 10
+    assert_retry_at_boundary(limiter, "a", denied, START + 10)
+
+
+def test_peek_does_not_count():
+    limiter = SlidingWindowLimiter(hourly=1, daily=10)
+    assert limiter.peek("a", now=START).allowed
+    assert limiter.hit("a", now=START).allowed
+    assert not limiter.hit("a", now=START).allowed
+
+
+def test_client_table_is_bounded():
+    limiter = SlidingWindowLimiter(hourly=10, daily=100, max_clients=3)
+    for client in "abcde":
+        limiter.hit(client, now=START)
+    assert len(limiter) == 3
+    assert limiter.evictions == 2
@@ -0,0 +1,84 @@
+import json
+
+from stream_parser import RecipeStreamParser
+
+RECIPES = [
+    {"name": "Tofu {Stir} Fry", "instructions": ["Say \"done\" when the } is crisp", "Use a \\ slash"]},
+    {"name": "Rice Bowl", "nutrition": {"calories": 400, "protein": 30}},
+]
+
+
+def feed_all(parser, chunks):
+    recipes = []
+    for chunk in chunks:
+        recipes.extend(parser.feed(chunk))
+    return recipes
+
+
+def test_every_split_point_yields_the_same_recipes():
+    text = "Here you go:\n" + json.dumps(RECIPES) + "\nEnjoy!"
+    for split in range(1, len(text)):
+        parser = RecipeStreamParser()
+        assert feed_all(parser, [text[:split], text[split:]]) == RECIPES
+        assert parser.complete
+        assert parser.text == text
+
+
+def test_single_character_chunks():
+    text = json.dumps(RECIPES)
+    parser = RecipeStreamParser()
+    assert feed_all(parser, list(text)) == RECIPES
+    assert parser.complete
+
+
+def test_object_is_returned_as_soon_as_it_closes():
+    text = json.dumps(RECIPES)
+    first_end = text.index(json.dumps(RECIPES[0])) + len(json.dumps(RECIPES[0]))
+    parser = RecipeStreamParser()
+    assert parser.feed(text[:first_end]) == [RECIPES[0]]
+    assert not parser.complete
+    assert parser.feed(text[first_end:]) == [RECIPES[1]]
+
+
+def test_truncated_array_is_not_complete():
+    text = json.dumps(RECIPES)
+    parser = RecipeStreamParser()
+    assert feed_all(parser, [text[:len(text) - 5]]) == [RECIPES[0]]
+    assert not parser.complete
+
+
+def test_bracket_in_prose_before_the_array_does_not_complete():
+    parser = RecipeStreamParser()
+    parser.feed("Recipes [3 total]: [")
+    assert not parser.complete
+    parser.feed(json.dumps(RECIPES[0]) + "]")
+    assert parser.complete
+
+
+def test_broken_object_is_skipped_and_marks_incomplete():
+    parser = RecipeStreamParser()
+    recipes = parser.feed('[{"name": "Bad", "calories": 4 00}, ' + json.dumps(RECIPES[1]) + "]")
+    assert recipes == [RECIPES[1]]
+    assert not parser.complete
+
+
+def test_braces_in_prose_before_the_array_are_skipped():
+    parser = RecipeStreamParser()
+    recipes = feed_all(parser, ["Here are 3 recipes {as requested}: ", json.dumps(RECIPES)])
+    assert recipes == RECIPES
+    assert parser.complete
+
+
+def test_wrapper_object_yields_its_recipes():
+    text = json.dumps({"recipes": RECIPES})
+    for split in range(1, len(text)):
+        parser = RecipeStreamParser()
+        assert feed_all(parser, [text[:split], text[split:]]) == RECIPES
+        assert parser.complete
+
+
+def test_objects_after_the_array_are_ignored():
+    parser = RecipeStreamParser()
+    recipes = parser.feed(json.dumps(RECIPES) + ' Note: {"name": "Not a recipe"} [{"name": "Nor this"}]')
+    assert recipes == RECIPES
+    assert parser.complete